@@ -6,6 +6,91 @@ class Settings(BaseSettings):
 
     ZOU_API_URL: str = os.environ.get("ZOU_API_URL", "http://localhost:5001")
     DATABASE_URL: str = os.environ.get("DATABASE_URL")
+    DATABASE_READ_URL: str = os.environ.get("DATABASE_READ_URL", "")  # optional read replica; empty = read from DATABASE_URL
+
+    # Server config (production mode of run.py)
+    APP_ENV: str = "development"  # "production" makes run.py start the multi-worker server
+    WEB_CONCURRENCY: int = 0  # worker processes in production; 0 = one per CPU
+    WEB_MAX_REQUESTS: int = 20000  # requests served before a worker is recycled; 0 disables
+    WEB_MAX_REQUESTS_JITTER: int = 2000  # random extra requests so workers do not recycle together
+    WEB_GRACEFUL_TIMEOUT: int = 30  # seconds a stopping worker gets to finish in-flight requests
+    WEB_KEEPALIVE_TIMEOUT: int = 5  # seconds an idle client connection is kept open
+
+    # Database pool config
+    DB_CONNECTION_BUDGET: int = 40  # Postgres connections shared by all workers of this instance
+    DB_POOL_TIMEOUT: int = 10  # seconds a query waits for a free pooled connection before failing
+    DB_CONNECT_TIMEOUT: int = 5  # seconds to open a new Postgres connection
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # server-side statement_timeout of every query; 0 disables
+    DB_WARMUP_CONNECTIONS: int = 0  # pooled connections opened before the worker takes traffic; 0 disables
+    DB_READY_TIMEOUT: float = 2.0  # seconds the readiness probe query may take
+    DB_READ_CONNECTION_BUDGET: int = 40  # replica connections shared by all workers of this instance
+    DB_READ_YOUR_WRITES_WINDOW: float = 5.0  # seconds after a write during which that client reads from the primary
+
+    # Zou HTTP client pool config
+    ZOU_POOL_MAX_CONNECTIONS: int = 100
+    ZOU_POOL_MAX_KEEPALIVE: int = 20
+    ZOU_POOL_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    ZOU_CONNECT_TIMEOUT: float = 3.0  # seconds
+    ZOU_TIMEOUT: float = 10.0  # seconds, read/write
+    ZOU_POOL_TIMEOUT: float = 5.0  # seconds waiting for a free connection
+    ZOU_HTTP2: bool = False  # requires the `h2` package
+    ZOU_CLIENT_IDLE_TIMEOUT: float = 300.0  # seconds before an unused per-host client is closed
+    ZOU_MAX_CLIENTS: int = 32  # distinct Zou base URLs kept open at once
+    ZOU_LOGIN_CONNECT_TIMEOUT: float = 2.0  # seconds
+    ZOU_LOGIN_TIMEOUT: float = 5.0  # seconds, read/write
+
+    # Validated bearer token cache config
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    TOKEN_CACHE_TTL: float = 30.0  # seconds a valid token is trusted without asking Zou
+    TOKEN_CACHE_NEGATIVE_TTL: float = 5.0  # seconds a rejected (401) token is remembered
+
+    # List pagination config
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+    EXPORT_CHUNK_SIZE: int = 1000  # rows fetched per query by the NDJSON exports
+    VERSION_BATCH_MAX: int = 1000  # versions accepted by one batch publish
+    MASTERSHOT_BATCH_MAX: int = 1000  # (shot_id, task_id) pairs accepted by one batch lookup
+    NAS_CACHE_CHECK_INTERVAL: float = 5.0  # seconds between NAS cache version stamp checks
+
+    # Version shot lock config
+    VERSION_LOCK_LEASE: float = 300.0  # seconds a lock lives without a heartbeat
+    VERSION_LOCK_LEASE_MAX: float = 3600.0  # longest lease a client may ask for
+
+    # Version retention config
+    RETENTION_ENABLED: bool = False  # run the pruning job from the app lifespan
+    RETENTION_DRY_RUN: bool = False  # only count what would be pruned
+    RETENTION_KEEP_UNCOMMITTED: int = 10  # newest uncommitted versions kept per shot/task
+    RETENTION_MANUAL_RUNS: bool = False  # let POST /retention/run delete; otherwise it only dry-runs
+    RETENTION_INTERVAL: float = 3600.0  # seconds between runs
+    RETENTION_ALLOWED_HOURS: str = "22-6"  # local hours runs may work in, e.g. "22-6" or "1,2,3"; empty for any
+    RETENTION_MASTERS_PER_BATCH: int = 200  # master shots ranked per batch
+    RETENTION_BATCH_SIZE: int = 500  # versions deleted per transaction
+    RETENTION_BATCH_PAUSE: float = 0.2  # seconds between batches
+    RETENTION_LOCK_TIMEOUT_MS: int = 2000  # give up a batch instead of waiting on row locks
+    RETENTION_STATEMENT_TIMEOUT_MS: int = 30000
+
+    # Change feed config
+    EVENTS_BACKEND: str = "memory"  # "memory" (single worker) or "postgres" (LISTEN/NOTIFY, requires `asyncpg`)
+    EVENTS_CHANNEL: str = "kiyokai_events"  # Postgres NOTIFY channel
+    EVENTS_BUFFER_SIZE: int = 5000  # recent events kept for Last-Event-ID resume
+    EVENTS_QUEUE_SIZE: int = 1000  # undelivered events per subscriber before it is disconnected
+    EVENTS_KEEPALIVE: float = 15.0  # seconds of silence before a keep-alive is sent
+
+    # Response compression config
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent uncompressed
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"  # server preference; zstd needs `zstandard`, br needs `brotli`
+    COMPRESSION_GZIP_LEVEL: int = 3  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11
+    COMPRESSION_ZSTD_LEVEL: int = 3  # 1-22
+
+    # Metrics config
+    METRICS_ENABLED: bool = True  # expose Prometheus metrics on /metrics
+
+    # Query tracing config
+    DB_SLOW_QUERY_MS: float = 200.0  # queries at least this slow are logged with their shape
+    DB_N_PLUS_ONE_THRESHOLD: int = 10  # same-shaped queries in one request before an N+1 warning
+    DB_DEBUG_HEADERS: bool = False  # add X-DB-Query-Count, X-DB-Time-Ms and Server-Timing to responses
 
     # Add cookie config
     COOKIE_REFRESH_TOKEN_NAME: str = "refresh_token"
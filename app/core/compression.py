@@ -0,0 +1,173 @@
+import gzip
+from typing import Callable, Dict, List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+from app.core.metrics import COMPRESSION_BYTES, COMPRESSION_DURATION
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+# Only these are compressed; SSE and NDJSON streams are left alone so every event
+# or row reaches the client as soon as it is sent
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/css", "application/javascript")
+
+def _gzip(data: bytes, level: int) -> bytes:
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+def _brotli(data: bytes, level: int) -> bytes:
+    return brotli.compress(data, quality=level, mode=brotli.MODE_TEXT)
+
+def _zstd(data: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+# Content encodings available in this process, by token
+ENCODERS: Dict[str, Callable[[bytes, int], bytes]] = {"gzip": _gzip}
+if brotli is not None:
+    ENCODERS["br"] = _brotli
+if zstandard is not None:
+    ENCODERS["zstd"] = _zstd
+
+def levels() -> Dict[str, int]:
+    return {
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_QUALITY,
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    }
+
+def offered_encodings() -> List[str]:
+    """
+    COMPRESSION_ENCODINGS in preference order, without the ones not installed.
+    """
+    tokens = (token.strip().lower() for token in settings.COMPRESSION_ENCODINGS.split(","))
+    return [token for token in tokens if token in ENCODERS]
+
+def negotiate(accept_encoding: str, offered: Sequence[str]) -> Optional[str]:
+    """
+    Pick the content encoding for an Accept-Encoding header: the highest q-value wins,
+    ties go to the earlier entry of `offered`. None when nothing acceptable is offered.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    level = levels()[encoding] if level is None else level
+    with COMPRESSION_DURATION.time(encoding=encoding):
+        body = ENCODERS[encoding](data, level)
+    COMPRESSION_BYTES.inc(len(data), encoding=encoding, stage="in")
+    COMPRESSION_BYTES.inc(len(body), encoding=encoding, stage="out")
+    return body
+
+def _weaken_etag(headers: MutableHeaders):
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    return headers.get("content-type", "").split(";")[0].strip().lower() in COMPRESSIBLE_TYPES
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing JSON and text responses of at least COMPRESSION_MIN_SIZE
+    bytes with the best encoding the client accepts (zstd, br and gzip by default, the
+    first two when their packages are installed). Streamed bodies pass through as-is.
+    Strong ETags of compressed responses are weakened, as the bytes differ per encoding,
+    and so are those of 304s to clients that accept an encoding.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.offered = offered_encodings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.offered)
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                if message["status"] == 304 and encoding is not None:
+                    # No body to compress, but the 200 this stands for was compressed:
+                    # send the same weak validator so the ETag does not flip between them
+                    _weaken_etag(headers)
+                    headers.add_vary_header("Accept-Encoding")
+                    passthrough = True
+                    await send({**message, "headers": headers.raw})
+                    return
+                if not _compressible(headers):
+                    passthrough = True
+                    await send(message)
+                    return
+                # The response may vary on Accept-Encoding even when this one is not compressed
+                headers.add_vary_header("Accept-Encoding")
+                start_message = {**message, "headers": headers.raw}
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if encoding is None or message.get("more_body", False) or len(body) < settings.COMPRESSION_MIN_SIZE:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            if len(compressed) >= len(body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            _weaken_etag(headers)
+            passthrough = True
+            await send({**start_message, "headers": headers.raw})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
\ No newline at end of file
@@ -0,0 +1,114 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core.read_routing import reader
+
+class Validator:
+    """
+    Cache validator of a resource: the newest updated_at it depends on and how many rows it has.
+    Adding, changing or deleting any row changes at least one of the two.
+    """
+
+    def __init__(self, scope: str, last_modified: Optional[datetime], count: int, variant: str = ""):
+        self.scope = scope
+        self.last_modified = last_modified
+        self.count = count
+        self.variant = variant
+
+    @property
+    def exists(self) -> bool:
+        return self.count > 0
+
+    @property
+    def etag(self) -> str:
+        stamp = self.last_modified.isoformat() if self.last_modified else ""
+        digest = hashlib.sha1(f"{self.scope}|{stamp}|{self.count}|{self.variant}".encode()).hexdigest()
+        return f'"{digest}"'
+
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+def _as_utc(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+def not_modified(request: Request, validator: Validator) -> Optional[Response]:
+    """
+    Return a 304 response when the client's copy is still current, otherwise None.
+    If-None-Match takes precedence over If-Modified-Since.
+    """
+    if not validator.exists:
+        return None
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, validator.etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if not if_modified_since or not validator.last_modified:
+            return None
+        try:
+            since = _as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return None
+        # HTTP dates have one second precision
+        fresh = validator.last_modified.replace(microsecond=0) <= since
+
+    if fresh:
+        return Response(status_code=304, headers=validator.headers())
+    return None
+
+def with_validator(response: Response, validator: Validator) -> Response:
+    response.headers.update(validator.headers())
+    return response
+
+async def versions_validator(shot_id: str, task_id: str, variant: str = "") -> Validator:
+    """
+    Validator of the versions of a (shot_id, task_id), from one aggregate on its unique index.
+    """
+    rows = await reader().query_raw(
+        'SELECT MAX("updated_at") AS "last_modified", COUNT(*)::int AS "count" '
+        'FROM "VersionShot" WHERE "shot_id" = $1 AND "task_id" = $2',
+        shot_id, task_id,
+    )
+    row = rows[0]
+    return Validator(f"versions:{shot_id}:{task_id}", _as_utc(row["last_modified"]), row["count"], variant)
+
+async def mastershot_validator(mastershot_id: str, variant: str = "") -> Validator:
+    """
+    Validator of a master shot as returned by GET /mastershots/{id}:
+    the master row, its NAS server and its versions.
+    """
+    rows = await reader().query_raw(
+        'SELECT GREATEST(m."updated_at", n."updated_at", MAX(v."updated_at")) AS "last_modified", '
+        'COUNT(v."id")::int + 1 AS "count" '
+        'FROM "MasterShot" m '
+        'LEFT JOIN "NasServer" n ON n."id" = m."nas_server_id" '
+        'LEFT JOIN "VersionShot" v ON v."master_shot_id" = m."id" '
+        'WHERE m."id" = $1 '
+        'GROUP BY m."updated_at", n."updated_at"',
+        mastershot_id,
+    )
+    if not rows:
+        return Validator(f"mastershot:{mastershot_id}", None, 0, variant)
+    row = rows[0]
+    return Validator(f"mastershot:{mastershot_id}", _as_utc(row["last_modified"]), row["count"], variant)
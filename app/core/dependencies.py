@@ -1,14 +1,19 @@
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import HTTPException, Depends, status, Request
 from typing import Optional
-import requests
+import httpx
 import logging
 
+from app.core.token_cache import token_cache
+from app.core.zou import get_zou_client
+from app.core.metrics import zou_call
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 logger = logging.getLogger(__name__)
 
-def get_current_user(token: str = Depends(oauth2_scheme), request: Request = None):
+async def get_current_user(token: str = Depends(oauth2_scheme), request: Request = None):
     """
     Validate token with external authentication service.
     Extracts zou_url from request headers or session data.
@@ -34,21 +39,18 @@ def get_current_user(token: str = Depends(oauth2_scheme), request: Request = Non
             detail="zou_url is required for authentication validation"
         )
 
-    try:
-        # Validate token with external auth service
-        auth_url = f"{zou_url}/auth/authenticated"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json"
-        }
-
-        response = requests.get(auth_url, headers=headers, timeout=10)
+    async def fetch_user():
+        # Validate token with external auth service, using the pooled client of this Zou host
+        with zou_call("get_current_user"):
+            response = await get_zou_client(zou_url).get(
+                "/auth/authenticated",
+                headers={"Authorization": f"Bearer {token}"}
+            )
 
         if response.status_code == 200:
-            user_data = response.json()
-            return user_data
+            return response.json()
         elif response.status_code == 401:
-            raise credentials_exception
+            return None
         else:
             logger.error(f"Auth service error: {response.status_code} - {response.text}")
             raise HTTPException(
@@ -56,7 +58,11 @@ def get_current_user(token: str = Depends(oauth2_scheme), request: Request = Non
                 detail="Authentication service unavailable"
             )
 
-    except requests.RequestException as e:
+    try:
+        user_data = await token_cache.get_or_fetch(zou_url, token, fetch_user)
+    except HTTPException:
+        raise
+    except httpx.RequestError as e:
         logger.error(f"Network error during auth validation: {e}")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -66,7 +72,11 @@ def get_current_user(token: str = Depends(oauth2_scheme), request: Request = Non
         logger.error(f"Unexpected error during auth validation: {e}")
         raise credentials_exception
 
-def get_optional_current_user(token: Optional[str] = Depends(oauth2_scheme), request: Request = None):
+    if user_data is None:
+        raise credentials_exception
+    return user_data
+
+async def get_optional_current_user(token: Optional[str] = Depends(optional_oauth2_scheme), request: Request = None):
     """
     Optional token validation - returns None if no token or invalid token.
     Useful for endpoints that can work with or without authentication.
@@ -75,6 +85,6 @@ def get_optional_current_user(token: Optional[str] = Depends(oauth2_scheme), req
         return None
 
     try:
-        return get_current_user(token, request)
+        return await get_current_user(token, request)
     except HTTPException:
         return None
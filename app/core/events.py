@@ -0,0 +1,298 @@
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.config import settings
+from app.core.prisma import db
+from app.core.responses import dumps, to_dict
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - asyncpg is only needed by the postgres backend
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+# Columns kept when a full row does not fit in a NOTIFY payload (8000 bytes)
+EVENT_KEY_FIELDS = (
+    "id", "project_id", "episode_id", "sequence_id", "shot_id", "task_id",
+    "master_shot_id", "version_number", "commited", "locked", "locked_by_user_id",
+    "locked_by_user_name", "updated_at",
+)
+_NOTIFY_MAX_BYTES = 7900
+
+# Connection string parameters only Prisma understands. asyncpg would send unknown ones
+# to the server as settings, and Prisma's sslcert is a CA certificate, not libpq's client one.
+_PRISMA_ONLY_PARAMS = {
+    "schema", "connection_limit", "pool_timeout", "connect_timeout", "socket_timeout",
+    "pgbouncer", "statement_cache_size", "options", "sslcert", "sslidentity", "sslpassword", "sslaccept",
+}
+
+def listener_dsn(dsn: str) -> str:
+    """
+    DATABASE_URL for asyncpg: Prisma-only parameters removed, sslmode and the like kept.
+    """
+    parts = urlsplit(dsn)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key not in _PRISMA_ONLY_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def _event_id() -> str:
+    # Millisecond prefix keeps ids roughly time ordered across workers
+    return f"{int(time.time() * 1000):x}-{secrets.token_hex(4)}"
+
+def make_event(model: str, action: str, row: Any) -> dict:
+    """
+    Event envelope sent to subscribers, e.g. type "versionshot.locked".
+    """
+    return {
+        "id": _event_id(),
+        "type": f"{model.lower()}.{action}",
+        "model": model,
+        "action": action,
+        "timestamp": datetime.now(timezone.utc),
+        "data": to_dict(row),
+    }
+
+class EventFilter:
+    """
+    Which events a subscriber wants; unset fields match everything.
+    """
+
+    def __init__(self, project_id: Optional[str] = None, shot_id: Optional[str] = None, task_id: Optional[str] = None):
+        self.project_id = project_id
+        self.shot_id = shot_id
+        self.task_id = task_id
+
+    def matches(self, event: dict) -> bool:
+        data = event.get("data") or {}
+        for column in ("project_id", "shot_id", "task_id"):
+            value = getattr(self, column)
+            if value is not None and data.get(column) != value:
+                return False
+        return True
+
+class Subscription:
+    """
+    One connected client. Events wait in a bounded queue; a client that falls
+    EVENTS_QUEUE_SIZE events behind is disconnected and resumes with Last-Event-ID.
+    """
+
+    def __init__(self, event_filter: EventFilter, queue_size: int):
+        self.filter = event_filter
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def deliver(self, event: dict):
+        if self.closed or not self.filter.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        # Make room for the end-of-stream marker; dropped events stay in the resume buffer
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+class MemoryBackend:
+    """
+    Delivers events to the subscribers of this process only. Enough for a single worker.
+    """
+
+    def __init__(self):
+        self.broker: Optional["EventBroker"] = None
+
+    async def start(self, broker: "EventBroker"):
+        self.broker = broker
+
+    async def publish(self, event: dict):
+        self.broker.dispatch(event)
+
+    async def stop(self):
+        pass
+
+class PostgresBackend:
+    """
+    Fans events out to every worker through Postgres LISTEN/NOTIFY.
+
+    Events are published with pg_notify() over the Prisma connection and each
+    worker listens on a dedicated asyncpg connection, so a worker also receives
+    its own events and every worker sees them in the same (commit) order.
+    """
+
+    def __init__(self, dsn: str, channel: str, reconnect_delay: float = 2.0):
+        if asyncpg is None:
+            raise RuntimeError("EVENTS_BACKEND=postgres requires the `asyncpg` package")
+        self.dsn = listener_dsn(dsn)
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.broker: Optional["EventBroker"] = None
+        self._connection = None
+        self._task: Optional[asyncio.Task] = None
+        self._lost = asyncio.Event()
+
+    def _on_notify(self, connection, pid, channel, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed event payload on {channel}")
+            return
+        self.broker.dispatch(event)
+
+    def _on_terminate(self, connection):
+        logger.warning("Event listener connection lost, reconnecting")
+        self._lost.set()
+
+    async def _listen(self):
+        self._connection = await asyncpg.connect(self.dsn)
+        self._connection.add_termination_listener(self._on_terminate)
+        await self._connection.add_listener(self.channel, self._on_notify)
+        self._lost.clear()
+
+    async def _supervise(self):
+        while True:
+            await self._lost.wait()
+            # Notifications sent while disconnected are gone; resuming clients must resync
+            self.broker.reset_buffer()
+            try:
+                await self._listen()
+            except Exception as e:
+                logger.error(f"Event listener reconnect failed: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self, broker: "EventBroker"):
+        self.broker = broker
+        await self._listen()
+        self._task = asyncio.create_task(self._supervise())
+
+    async def publish(self, event: dict):
+        payload = dumps(event)
+        if len(payload) > _NOTIFY_MAX_BYTES:
+            data = event.get("data") or {}
+            payload = dumps({**event, "data": {k: data[k] for k in EVENT_KEY_FIELDS if k in data}, "truncated": True})
+        # execute_raw: Prisma cannot deserialize the void column pg_notify() returns
+        await db.execute_raw("SELECT pg_notify($1, $2)", self.channel, payload.decode())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+class EventBroker:
+    """
+    In-process pub/sub of MasterShot and VersionShot changes.
+
+    Handlers call publish() after a successful write; the backend decides how the
+    event reaches every worker and then calls dispatch() in each of them. The last
+    EVENTS_BUFFER_SIZE events are kept so a reconnecting client can resume from its
+    Last-Event-ID instead of re-reading everything.
+    """
+
+    def __init__(self, backend, buffer_size: int, queue_size: int):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._buffer: Deque[dict] = deque(maxlen=buffer_size)
+        self._subscriptions: Set[Subscription] = set()
+
+    async def start(self):
+        await self.backend.start(self)
+
+    async def stop(self):
+        for subscription in list(self._subscriptions):
+            subscription.close()
+        await self.backend.stop()
+
+    async def publish(self, model: str, action: str, row: Any):
+        """
+        Publish a change. Never raises: a lost event must not fail the write that caused it.
+        """
+        try:
+            await self.backend.publish(make_event(model, action, row))
+        except Exception as e:
+            logger.error(f"Failed to publish {model.lower()}.{action} event: {e}")
+
+    async def publish_many(self, model: str, action: str, rows: List[Any]):
+        for row in rows:
+            await self.publish(model, action, row)
+
+    def dispatch(self, event: dict):
+        self._buffer.append(event)
+        for subscription in list(self._subscriptions):
+            subscription.deliver(event)
+
+    def reset_buffer(self):
+        self._buffer.clear()
+
+    def subscribe(self, event_filter: EventFilter, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Register a subscriber. With last_event_id, every buffered event after it is
+        queued first; when that id is no longer buffered a `resync` event is queued
+        instead, telling the client to reload through the list or export endpoints.
+        """
+        subscription = Subscription(event_filter, self.queue_size)
+        # No await between replay and registration, so nothing is missed or sent twice
+        if last_event_id:
+            ids = [event["id"] for event in self._buffer]
+            if last_event_id in ids:
+                for event in list(self._buffer)[ids.index(last_event_id) + 1:]:
+                    subscription.deliver(event)
+            else:
+                subscription.queue.put_nowait({
+                    "id": last_event_id,
+                    "type": "resync",
+                    "timestamp": datetime.now(timezone.utc),
+                    "data": None,
+                })
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    async def listen(self, subscription: Subscription, keepalive: float) -> AsyncIterator[Optional[dict]]:
+        """
+        Yield the events of a subscription, or None every `keepalive` seconds of silence.
+        Ends when the subscription is closed.
+        """
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "subscribers": len(self._subscriptions),
+            "buffered": len(self._buffer),
+        }
+
+def _build_backend():
+    if settings.EVENTS_BACKEND == "postgres":
+        return PostgresBackend(settings.DATABASE_URL, settings.EVENTS_CHANNEL)
+    if settings.EVENTS_BACKEND != "memory":
+        raise RuntimeError(f"Unknown EVENTS_BACKEND '{settings.EVENTS_BACKEND}'")
+    return MemoryBackend()
+
+broker = EventBroker(_build_backend(), buffer_size=settings.EVENTS_BUFFER_SIZE, queue_size=settings.EVENTS_QUEUE_SIZE)
@@ -0,0 +1,139 @@
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, create_model
+
+from app.generated.prisma import models
+
+# Relation fields per Prisma model; everything else on the model is a scalar column.
+RELATIONS: Dict[str, Tuple[str, ...]] = {
+    "MasterShot": ("nas_server", "version_shots"),
+    "VersionShot": ("master_shot",),
+    "NasServer": ("master_shots",),
+}
+
+# Always selected: the primary key, plus created_at when the rows feed a keyset cursor.
+KEYSET_FIELDS = ("id", "created_at")
+
+def _model(name: str) -> type:
+    return getattr(models, name)
+
+def scalar_fields(model_name: str) -> Tuple[str, ...]:
+    relations = RELATIONS.get(model_name, ())
+    return tuple(f for f in _model(model_name).model_fields if f not in relations)
+
+@lru_cache(maxsize=256)
+def partial_model(model_name: str, fields: Tuple[str, ...], relations: Tuple[str, ...]) -> type:
+    """
+    Build (once per shape) a pydantic model with only the requested columns.
+    Prisma builds the query selection from the model's fields, so querying through
+    it pushes the projection down into the SQL SELECT, the same way generated
+    partial types do.
+    """
+    full = _model(model_name)
+    definitions: Dict[str, Any] = {}
+    for name in fields + relations:
+        definitions[name] = (Optional[full.model_fields[name].annotation], None)
+
+    class PartialBase(BaseModel):
+        __prisma_model__: ClassVar[str] = model_name
+
+    return create_model(f"{model_name}Partial", __base__=PartialBase, **definitions)
+
+class Selection:
+    """
+    Sparse fieldset of a request: which columns and relations to fetch.
+    `fields` is None when the client did not ask for a projection.
+    `include` is passed to Prisma; `cached` lists requested relations that are
+    attached from an in-process cache instead of being joined.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        fields: Optional[Tuple[str, ...]],
+        include: Optional[dict],
+        cached: Optional[Dict[str, str]] = None,
+    ):
+        self.model_name = model_name
+        self.fields = fields
+        self.include = include
+        self.cached = cached or {}
+
+    def wants(self, relation: str) -> bool:
+        return relation in self.cached or relation in (self.include or {})
+
+    def delegate(self, delegate: Any, keyset: bool = False) -> Any:
+        """
+        Return a Prisma delegate that only selects the requested fields.
+        Pass keyset=True when the rows are used to build a pagination cursor.
+        """
+        if self.fields is None:
+            return delegate
+        required = KEYSET_FIELDS if keyset else KEYSET_FIELDS[:1]
+        # Cached relations are attached through their foreign key, so it must be selected
+        fields = tuple(dict.fromkeys(required + self.fields + tuple(self.cached.values())))
+        relations = tuple(sorted(self.include or ()))
+        return type(delegate)(delegate._client, partial_model(self.model_name, fields, relations))
+
+    def project(self, row: dict, extra: Tuple[str, ...] = ()) -> dict:
+        """
+        Apply the selection to a row fetched as a dict by a raw query.
+        `extra` keys are computed attributes that are always kept.
+        """
+        included = set(self.include or ()) | set(self.cached)
+        dropped = {r for r in RELATIONS.get(self.model_name, ()) if r not in included}
+        if self.fields is None:
+            return {k: v for k, v in row.items() if k not in dropped}
+        keep = set(KEYSET_FIELDS[:1] + self.fields + extra) | included
+        return {k: v for k, v in row.items() if k in keep}
+
+def _split(raw: Optional[str]) -> Tuple[str, ...]:
+    if not raw:
+        return ()
+    return tuple(dict.fromkeys(part.strip() for part in raw.split(",") if part.strip()))
+
+def sparse_fields(
+    model_name: str,
+    default_include: Optional[dict] = None,
+    cached_relations: Optional[Dict[str, str]] = None,
+):
+    """
+    Dependency factory for the `fields=` and `include=` query parameters.
+
+    Without `fields`, every column is returned along with `default_include`, as before.
+    With `fields`, only those columns are selected and relations are opt-in through `include`.
+    `cached_relations` maps relations served from a cache to their foreign key column;
+    they are left out of the Prisma include and reported in Selection.cached instead.
+    """
+    cached_relations = cached_relations or {}
+    allowed = set(scalar_fields(model_name))
+    relations = set(RELATIONS.get(model_name, ()))
+
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma separated columns to return, e.g. id,version_number,locked"),
+        include: Optional[str] = Query(None, description=f"Comma separated relations to join: {', '.join(sorted(relations))}"),
+    ) -> Selection:
+        requested = _split(fields)
+        unknown = [f for f in requested if f not in allowed]
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(unknown)}")
+
+        joined = _split(include)
+        unknown = [r for r in joined if r not in relations]
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown relations: {', '.join(unknown)}")
+
+        if include is not None:
+            include_arg = {r: True for r in joined} or None
+        elif requested:
+            include_arg = None
+        else:
+            include_arg = default_include
+
+        cached = {r: fk for r, fk in cached_relations.items() if r in (include_arg or {})}
+        include_arg = {r: v for r, v in (include_arg or {}).items() if r not in cached} or None
+        return Selection(model_name, requested or None, include_arg, cached)
+
+    return dependency
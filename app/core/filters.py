@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Query
+
+class HierarchyFilter:
+    """
+    Query parameters filtering shots by production hierarchy and update time.
+    Use as `filters: HierarchyFilter = Depends()`; every parameter is optional.
+    Each combination is backed by a composite index in prisma/schema.prisma.
+    """
+
+    def __init__(
+        self,
+        project_id: Optional[str] = Query(None, description="Filter by project"),
+        episode_id: Optional[str] = Query(None, description="Filter by episode"),
+        sequence_id: Optional[str] = Query(None, description="Filter by sequence"),
+        shot_id: Optional[str] = Query(None, description="Filter by shot"),
+        task_id: Optional[str] = Query(None, description="Filter by task"),
+        updated_after: Optional[datetime] = Query(None, description="Only rows updated at or after this time"),
+        updated_before: Optional[datetime] = Query(None, description="Only rows updated before this time"),
+    ):
+        self.project_id = project_id
+        self.episode_id = episode_id
+        self.sequence_id = sequence_id
+        self.shot_id = shot_id
+        self.task_id = task_id
+        self.updated_after = updated_after
+        self.updated_before = updated_before
+
+    def where(self) -> Optional[dict]:
+        where = {}
+        for column in ("project_id", "episode_id", "sequence_id", "shot_id", "task_id"):
+            value = getattr(self, column)
+            if value is not None:
+                where[column] = value
+
+        updated_at = {}
+        if self.updated_after is not None:
+            updated_at["gte"] = self.updated_after
+        if self.updated_before is not None:
+            updated_at["lt"] = self.updated_before
+        if updated_at:
+            where["updated_at"] = updated_at
+        return where or None
+
+class VersionFilter(HierarchyFilter):
+    """
+    HierarchyFilter plus the lock and commit state of version shots.
+    """
+
+    def __init__(
+        self,
+        project_id: Optional[str] = Query(None, description="Filter by project"),
+        episode_id: Optional[str] = Query(None, description="Filter by episode"),
+        sequence_id: Optional[str] = Query(None, description="Filter by sequence"),
+        shot_id: Optional[str] = Query(None, description="Filter by shot"),
+        task_id: Optional[str] = Query(None, description="Filter by task"),
+        updated_after: Optional[datetime] = Query(None, description="Only rows updated at or after this time"),
+        updated_before: Optional[datetime] = Query(None, description="Only rows updated before this time"),
+        locked: Optional[bool] = Query(None, description="Filter by lock state"),
+        commited: Optional[bool] = Query(None, description="Filter by commit state"),
+    ):
+        super().__init__(project_id, episode_id, sequence_id, shot_id, task_id, updated_after, updated_before)
+        self.locked = locked
+        self.commited = commited
+
+    def where(self) -> Optional[dict]:
+        where = super().where() or {}
+        if self.locked is not None:
+            where["locked"] = self.locked
+        if self.commited is not None:
+            where["commited"] = self.commited
+        return where or None
@@ -0,0 +1,239 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric:
+    """
+    Base of the metric types: a name, help text and a fixed set of label names.
+    Values are kept per label combination, in this process only.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [bucket counts..., sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            series = self._values[key] = [0.0] * (len(self.buckets) + 1)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, series in self._values.items():
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {_format_value(count)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(series[-2])}")
+        return lines
+
+class Registry:
+    """
+    The metrics of this process. With several workers each one is scraped (or
+    labelled by the scraper) separately, like any multi-process Prometheus target.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "kiyokai_http_requests_total", "HTTP requests by route template, method and status.", ("method", "route", "status")
+)
+HTTP_ERRORS = registry.counter(
+    "kiyokai_http_request_errors_total", "HTTP responses with status >= 400, or unhandled exceptions (status 500).", ("method", "route", "status")
+)
+HTTP_DURATION = registry.histogram(
+    "kiyokai_http_request_duration_seconds", "Time from request start to the end of the response body.", ("method", "route")
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "kiyokai_http_requests_in_flight", "Requests currently being handled.", ("method",)
+)
+ZOU_DURATION = registry.histogram(
+    "kiyokai_zou_request_duration_seconds", "Upstream Zou calls by caller; outcome is error when the call raised.", ("caller", "outcome")
+)
+DB_DURATION = registry.histogram(
+    "kiyokai_db_query_duration_seconds", "Prisma queries by model and operation.", ("model", "operation", "outcome")
+)
+DB_IN_FLIGHT = registry.gauge(
+    "kiyokai_db_queries_in_flight", "Prisma queries in flight per client (primary or replica); above the pool's connection_limit they wait for a connection.", ("client",)
+)
+COMPRESSION_DURATION = registry.histogram(
+    "kiyokai_response_compression_duration_seconds", "Compression of response bodies by content encoding.", ("encoding",),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+COMPRESSION_BYTES = registry.counter(
+    "kiyokai_response_compression_bytes_total", "Response body bytes before (stage=in) and after (stage=out) compression.", ("encoding", "stage")
+)
+RENDER_DURATION = registry.histogram(
+    "kiyokai_response_render_duration_seconds", "JSON serialization of response bodies.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+@contextmanager
+def track(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """
+    Time a block into `histogram` with an extra `outcome` label of ok or error.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        histogram.observe(time.perf_counter() - start, outcome=outcome, **labels)
+
+def zou_call(caller: str):
+    return track(ZOU_DURATION, caller=caller)
+
+def route_template(scope) -> str:
+    """
+    Path template of the matched route (e.g. /api/v1/shots/versionshots/{versionshot_id}),
+    so metrics are grouped per route instead of per URL.
+    """
+    route = scope.get("route")
+    if route is None and scope.get("app") is not None:
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency, errors and in-flight requests.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec(method=method)
+            route = route_template(scope)
+            HTTP_DURATION.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
+            if status_code >= 400:
+                HTTP_ERRORS.inc(method=method, route=route, status=str(status_code))
\ No newline at end of file
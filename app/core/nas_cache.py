@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.core.prisma import db
+from app.core.responses import to_dict
+from app.generated.prisma.models import NasServer
+
+logger = logging.getLogger(__name__)
+
+class NasServerCache:
+    """
+    In-process read-through cache of the NasServer table.
+
+    The table holds a handful of rows and rarely changes, so every worker keeps
+    all of it in memory and master shot responses attach `nas_server` from here
+    instead of joining it.
+
+    Invalidation across workers uses a version stamp: (max(updated_at), count(*))
+    of the table, read with one aggregate query. A write through this worker calls
+    invalidate() and the next read reloads immediately. Other workers compare the
+    stamp at most every NAS_CACHE_CHECK_INTERVAL seconds and reload when it
+    differs, so a create, update or delete made anywhere is visible everywhere
+    within that interval. Any route that writes NasServer rows must call
+    invalidate() after the write.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._servers: Dict[str, NasServer] = {}
+        self._stamp: Optional[Tuple[Any, int]] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _read_stamp(self) -> Tuple[Any, int]:
+        rows = await db.query_raw('SELECT MAX("updated_at") AS "updated_at", COUNT(*)::int AS "count" FROM "NasServer"')
+        return rows[0]["updated_at"], rows[0]["count"]
+
+    async def load(self):
+        stamp = await self._read_stamp()
+        servers = await db.nasserver.find_many(order={"name": "asc"})
+        self._servers = {server.id: server for server in servers}
+        self._stamp = stamp
+        self._checked_at = time.monotonic()
+        logger.info(f"Loaded {len(servers)} NAS servers into cache")
+
+    def invalidate(self):
+        self._stamp = None
+
+    async def _ensure_fresh(self):
+        if self._stamp is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        async with self._lock:
+            # Another request may have refreshed while we waited
+            if self._stamp is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return
+            if self._stamp is None or await self._read_stamp() != self._stamp:
+                await self.load()
+            else:
+                self._checked_at = time.monotonic()
+
+    async def all(self) -> List[NasServer]:
+        await self._ensure_fresh()
+        return list(self._servers.values())
+
+    async def get(self, nas_server_id: Optional[str]) -> Optional[NasServer]:
+        if not nas_server_id:
+            return None
+        await self._ensure_fresh()
+        return self._servers.get(nas_server_id)
+
+    async def attach(self, rows: Iterable[Any]) -> List[dict]:
+        """
+        Return master shots (models or dicts) as dicts with `nas_server` set from the cache.
+        """
+        await self._ensure_fresh()
+        attached = []
+        for row in rows:
+            row = to_dict(row)
+            row["nas_server"] = self._servers.get(row.get("nas_server_id"))
+            attached.append(row)
+        return attached
+
+    async def attach_one(self, row: Any) -> Optional[dict]:
+        if row is None:
+            return None
+        return (await self.attach([row]))[0]
+
+nas_cache = NasServerCache(check_interval=settings.NAS_CACHE_CHECK_INTERVAL)
@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+
+from app.config import settings
+
+# Keyset order shared by every paginated list; (created_at, id) is unique and indexed.
+KEYSET_ORDER = [{"created_at": "asc"}, {"id": "asc"}]
+
+class PageParams:
+    """
+    Query parameters of a cursor-paginated list endpoint.
+    Use as `page: PageParams = Depends()`.
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="Maximum number of rows to return"),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+def encode_cursor(record: Any) -> str:
+    raw = json.dumps([record.created_at.isoformat(), record.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(record_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def keyset_where(where: Optional[dict], cursor: Optional[str]) -> Optional[dict]:
+    """
+    Add the "strictly after the cursor row" condition to a Prisma where clause.
+    """
+    if not cursor:
+        return where
+    created_at, record_id = decode_cursor(cursor)
+    return after_row_where(where, created_at, record_id)
+
+def after_row_where(where: Optional[dict], created_at: datetime, record_id: str) -> dict:
+    after = {
+        "OR": [
+            {"created_at": {"gt": created_at}},
+            {"created_at": created_at, "id": {"gt": record_id}},
+        ]
+    }
+    return {"AND": [where, after]} if where else after
+
+async def paginate(
+    delegate: Any,
+    page: PageParams,
+    where: Optional[dict] = None,
+    include: Optional[dict] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a Prisma model delegate ordered by (created_at, id).
+    Returns the rows and the cursor of the next page, or None on the last page.
+    """
+    rows = await delegate.find_many(
+        where=keyset_where(where, page.cursor),
+        include=include,
+        order=KEYSET_ORDER,
+        take=page.limit + 1,
+    )
+    next_cursor = encode_cursor(rows[page.limit - 1]) if len(rows) > page.limit else None
+    return rows[:page.limit], next_cursor
+
+def paginate_list(rows: List[Any], page: PageParams) -> Tuple[List[Any], Optional[str]]:
+    """
+    Same as paginate() for rows already in memory, e.g. from an in-process cache.
+    """
+    rows = sorted(rows, key=lambda row: (row.created_at, row.id))
+    if page.cursor:
+        created_at, record_id = decode_cursor(page.cursor)
+        rows = [row for row in rows if (row.created_at, row.id) > (created_at, record_id)]
+    next_cursor = encode_cursor(rows[page.limit - 1]) if len(rows) > page.limit else None
+    return rows[:page.limit], next_cursor
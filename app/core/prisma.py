@@ -1,11 +1,186 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.config import settings
 from app.generated.prisma import Prisma
+from app.core.metrics import DB_DURATION, DB_IN_FLIGHT
+from app.core.tracing import record_query
+
+logger = logging.getLogger(__name__)
+
+def _model_name(model) -> str:
+    if model is None:
+        return "raw"
+    return getattr(model, "__prisma_model__", None) or model.__name__
+
+def worker_connection_limit(replica: bool = False) -> int:
+    """
+    This worker's share of DB_CONNECTION_BUDGET (DB_READ_CONNECTION_BUDGET for the
+    replica). WEB_CONCURRENCY is set by run.py to the real worker count; on the primary
+    a LISTEN connection of the change feed is reserved.
+    """
+    workers = max(1, settings.WEB_CONCURRENCY)
+    if replica:
+        return max(1, settings.DB_READ_CONNECTION_BUDGET // workers)
+    reserved = 1 if settings.EVENTS_BACKEND == "postgres" else 0
+    return max(1, settings.DB_CONNECTION_BUDGET // workers - reserved)
+
+def datasource_url(url: Optional[str], connection_limit: Optional[int] = None) -> Optional[str]:
+    """
+    DATABASE_URL with this worker's pool size and the pool/connect/statement timeouts
+    from Settings. Parameters already present in the URL win.
+    """
+    if not url:
+        return url
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.setdefault("connection_limit", str(connection_limit or worker_connection_limit()))
+    query.setdefault("pool_timeout", str(settings.DB_POOL_TIMEOUT))
+    query.setdefault("connect_timeout", str(settings.DB_CONNECT_TIMEOUT))
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        query.setdefault("options", f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}")
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+class PoolStats:
+    """
+    What this worker knows about its Prisma pool. The engine does not expose its pool,
+    so saturation is inferred: queries in flight beyond connection_limit are waiting
+    for a connection.
+    """
+
+    def __init__(self, limit: int, name: str = "primary"):
+        self.limit = limit
+        self.name = name
+        self.healthy = True
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.saturated_queries = 0
+        self.warmed = 0
+        self.last_probe_ms: Optional[float] = None
+
+    def enter(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        if self.in_flight > self.limit:
+            self.saturated_queries += 1
+        DB_IN_FLIGHT.set(self.in_flight, client=self.name)
+
+    def exit(self):
+        self.in_flight -= 1
+        DB_IN_FLIGHT.set(self.in_flight, client=self.name)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "connection_limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": max(0, self.in_flight - self.limit),
+            "peak_in_flight": self.peak_in_flight,
+            "saturated_queries": self.saturated_queries,
+            "warmed_connections": self.warmed,
+            "last_probe_ms": self.last_probe_ms,
+            "healthy": self.healthy,
+            "pool_timeout_seconds": settings.DB_POOL_TIMEOUT,
+        }
 
-db = Prisma()
+pool_stats = PoolStats(worker_connection_limit())
+
+class InstrumentedPrisma(Prisma):
+    """
+    Prisma client that times every query per model and operation and reports it to the
+    request's query trace (slow-query log, N+1 detection, debug headers).
+    Every generated action and raw query goes through _execute().
+    """
+
+    # Set on the replica client; the primary and its transaction copies use pool_stats
+    pool: Optional[PoolStats] = None
+
+    async def _execute(self, *args, **kwargs):
+        model = _model_name(kwargs.get("model"))
+        operation = kwargs.get("method", "unknown")
+        outcome = "error"
+        start = time.perf_counter()
+        pool = self.pool or pool_stats
+        pool.enter()
+        try:
+            result = await super()._execute(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            pool.exit()
+            elapsed = time.perf_counter() - start
+            DB_DURATION.observe(elapsed, model=model, operation=operation, outcome=outcome)
+            record_query(model, operation, kwargs.get("arguments"), elapsed)
+
+def create_client(url: Optional[str], pool: Optional[PoolStats] = None) -> InstrumentedPrisma:
+    url = datasource_url(url, pool.limit if pool else None)
+    client = InstrumentedPrisma(datasource={"url": url}) if url else InstrumentedPrisma()
+    client.pool = pool
+    return client
+
+db = create_client(settings.DATABASE_URL)
+
+# Optional read replica (DATABASE_READ_URL); see app.core.read_routing for what reads from it
+replica_pool_stats: Optional[PoolStats] = None
+replica: Optional[InstrumentedPrisma] = None
+if settings.DATABASE_READ_URL:
+    replica_pool_stats = PoolStats(worker_connection_limit(replica=True), name="replica")
+    replica = create_client(settings.DATABASE_READ_URL, replica_pool_stats)
+
+def _stats(client: InstrumentedPrisma) -> PoolStats:
+    return client.pool or pool_stats
 
 async def connect_db():
     if not db.is_connected():
         await db.connect()
+    if replica is not None and not replica.is_connected():
+        try:
+            await replica.connect()
+        except Exception as e:
+            # Reads stay on the primary until a restart reconnects the replica
+            replica_pool_stats.healthy = False
+            logger.error(f"Could not connect to the read replica, reading from the primary: {e}")
 
 async def disconnect_db():
+    if replica is not None and replica.is_connected():
+        await replica.disconnect()
     if db.is_connected():
-        await db.disconnect()
\ No newline at end of file
+        await db.disconnect()
+
+async def ping(timeout: float, client: Optional[InstrumentedPrisma] = None) -> float:
+    """
+    Run `SELECT 1` on `client` (the primary by default) and return its time in
+    milliseconds, pool wait included. The outcome updates the pool's healthy flag.
+    """
+    client = client or db
+    stats = _stats(client)
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(client.query_raw("SELECT 1 AS ok"), timeout=timeout)
+    except Exception:
+        stats.healthy = False
+        raise
+    stats.healthy = True
+    stats.last_probe_ms = round((time.perf_counter() - start) * 1000, 2)
+    return stats.last_probe_ms
+
+async def warm_up(connections: int, client: Optional[InstrumentedPrisma] = None):
+    """
+    Open up to `connections` pooled connections before the worker takes traffic, so the
+    first requests after a rollout do not pay for connection setup. Overlapping short
+    sleeps make the engine open a separate connection for each.
+    """
+    client = client or db
+    stats = _stats(client)
+    connections = min(connections, stats.limit)
+    if connections <= 0 or not client.is_connected():
+        return
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(client.query_raw("SELECT pg_sleep(0.05) IS NULL AS ok") for _ in range(connections)),
+        return_exceptions=True,
+    )
+    stats.warmed = sum(1 for result in results if not isinstance(result, BaseException))
+    logger.info(f"Warmed {stats.warmed}/{connections} {stats.name} database connections in {(time.perf_counter() - start) * 1000:.0f} ms")
\ No newline at end of file
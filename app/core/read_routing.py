@@ -0,0 +1,111 @@
+import math
+import time
+from contextvars import ContextVar
+from http.cookies import CookieError, SimpleCookie
+
+from fastapi import Request
+
+from app.config import settings
+from app.core import prisma
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Explicit override: send every read of this request to the primary
+READ_YOUR_WRITES_HEADER = "x-read-your-writes"
+# Returned after a write as a header and a cookie; echoing either back keeps that
+# client's reads on the primary until the replica has caught up with its write
+READ_PRIMARY_HEADER = "x-read-primary-until"
+READ_PRIMARY_COOKIE = "kiyokai_read_primary_until"
+
+_READ_ONLY_SCOPE_KEY = "kiyokai.read_only"
+
+_use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+
+def reader() -> "prisma.InstrumentedPrisma":
+    """
+    Client for safe reads: the replica when DATABASE_READ_URL is set and the replica
+    is connected and healthy, unless this request is pinned to the primary.
+    Writes, and reads whose result feeds a write, use `prisma.db` directly.
+    """
+    replica = prisma.replica
+    if replica is None or _use_primary.get() or not prisma.replica_pool_stats.healthy or not replica.is_connected():
+        return prisma.db
+    return replica
+
+def _headers(scope) -> dict:
+    return {name.decode("latin-1"): value.decode("latin-1") for name, value in scope.get("headers", [])}
+
+def _until(value: str) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def wants_primary(scope) -> bool:
+    """
+    Whether the client asked for read-your-writes: the X-Read-Your-Writes header,
+    or a read-primary deadline from one of its recent writes that has not passed yet.
+    """
+    headers = _headers(scope)
+    if headers.get(READ_YOUR_WRITES_HEADER, "").strip().lower() in ("1", "true", "yes", "primary"):
+        return True
+    deadline = _until(headers.get(READ_PRIMARY_HEADER))
+    if "cookie" in headers:
+        try:
+            cookie = SimpleCookie(headers["cookie"]).get(READ_PRIMARY_COOKIE)
+        except CookieError:
+            cookie = None
+        if cookie is not None:
+            deadline = max(deadline, _until(cookie.value))
+    return deadline > time.time()
+
+async def read_only(request: Request):
+    """
+    Dependency of POST endpoints that only read (batch lookups): their reads are routed
+    like a GET and they do not start a read-your-writes window.
+    """
+    request.scope[_READ_ONLY_SCOPE_KEY] = True
+    _use_primary.set(wants_primary(request.scope))
+
+class ReadRoutingMiddleware:
+    """
+    ASGI middleware deciding per request whether reader() may use the replica.
+    Writes (any method but GET/HEAD/OPTIONS) read from the primary, and their successful
+    responses carry a read-primary deadline DB_READ_YOUR_WRITES_WINDOW seconds ahead,
+    as the X-Read-Primary-Until header and a cookie. Clients that send it back (the
+    cookie does so by itself) read from the primary until then, e.g. right after a publish.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        write = scope["method"] not in SAFE_METHODS
+        token = _use_primary.set(write or wants_primary(scope))
+
+        async def send_with_deadline(message):
+            if (
+                message["type"] == "http.response.start"
+                and write
+                and message["status"] < 400
+                and not scope.get(_READ_ONLY_SCOPE_KEY)
+            ):
+                window = settings.DB_READ_YOUR_WRITES_WINDOW
+                until = f"{time.time() + window:.3f}"
+                headers = list(message.get("headers", []))
+                headers.append((READ_PRIMARY_HEADER.encode(), until.encode()))
+                headers.append((
+                    b"set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={until}; Max-Age={math.ceil(window)}; Path=/; HttpOnly; SameSite=Lax".encode(),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_deadline)
+        finally:
+            _use_primary.reset(token)
\ No newline at end of file
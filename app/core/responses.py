@@ -0,0 +1,58 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.metrics import RENDER_DURATION
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def to_dict(model: Any) -> Any:
+    """
+    Shallow python-mode dump of a Prisma/pydantic model.
+    Datetimes are kept as-is and rendered by the JSON encoder.
+    """
+    if isinstance(model, BaseModel):
+        return model.model_dump() if hasattr(model, "model_dump") else model.dict()
+    return model
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return to_dict(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson is not None:
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+else:
+    def dumps(content: Any) -> bytes:
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse that renders Prisma models directly instead of going through jsonable_encoder.
+    Uses orjson when it is installed and falls back to the stdlib encoder otherwise.
+    Returned directly from a handler, it bypasses response_model validation and filtering.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with RENDER_DURATION.time():
+            return dumps(content)
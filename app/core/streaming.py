@@ -0,0 +1,62 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.core.pagination import KEYSET_ORDER, after_row_where
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+async def iter_rows(
+    delegate: Any,
+    where: Optional[dict] = None,
+    include: Optional[dict] = None,
+    chunk_size: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yield every row matching `where`, fetched from Prisma in (created_at, id) keyset chunks.
+    Only one chunk is held in memory at a time.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    chunk_where = where
+    while True:
+        rows = await delegate.find_many(where=chunk_where, include=include, order=KEYSET_ORDER, take=chunk_size)
+        for row in rows:
+            yield row
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1]
+        chunk_where = after_row_where(where, last.created_at, last.id)
+
+async def _ndjson_lines(rows: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    try:
+        async for row in rows:
+            yield dumps(row) + b"\n"
+    except Exception as e:
+        # Headers are already sent, so the only signal left is a truncated stream.
+        logger.error(f"NDJSON export aborted: {e}")
+        raise
+
+def ndjson_response(rows: AsyncIterator[Any]) -> StreamingResponse:
+    """
+    Stream rows as newline-delimited JSON.
+    X-Export-Started-At can be passed back as `since` for the next incremental sync.
+    """
+    return StreamingResponse(
+        _ndjson_lines(rows),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Export-Started-At": datetime.now(timezone.utc).isoformat()},
+    )
+
+def export_where(project_id: Optional[str], since: Optional[datetime]) -> Optional[dict]:
+    where = {}
+    if project_id:
+        where["project_id"] = project_id
+    if since:
+        where["updated_at"] = {"gte": since}
+    return where or None
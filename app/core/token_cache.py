@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+
+_MISSING = object()
+
+class TokenCache:
+    """
+    Bounded TTL/LRU cache of bearer tokens already validated against Zou.
+
+    Entries are keyed by a SHA-256 of the Zou base URL and the token, so raw
+    tokens are never kept in memory. A cached value of None means Zou answered
+    401 for that token (negative caching, with its own shorter TTL).
+    Concurrent lookups of the same uncached token share one upstream call.
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Optional[dict]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(base_url: str, token: str) -> str:
+        return hashlib.sha256(f"{base_url.rstrip('/')}\0{token}".encode()).hexdigest()
+
+    def get(self, base_url: str, token: str):
+        """
+        Return the cached user data, None for a cached rejection,
+        or the module-level _MISSING sentinel when nothing valid is cached.
+        """
+        key = self.make_key(base_url, token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            if user is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return user
+
+    def put(self, base_url: str, token: str, user: Optional[dict]):
+        self._store(self.make_key(base_url, token), user)
+
+    def invalidate(self, base_url: str, token: str):
+        with self._lock:
+            self._entries.pop(self.make_key(base_url, token), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: str, user: Optional[dict]):
+        ttl = self.ttl if user is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def get_or_fetch(
+        self,
+        base_url: str,
+        token: str,
+        fetch: Callable[[], Awaitable[Optional[dict]]],
+    ) -> Optional[dict]:
+        """
+        Return the user data for a token, calling `fetch` on a miss.
+        `fetch` returns the user data, None for a 401 (cached negatively),
+        or raises for anything that must not be cached.
+        """
+        cached = self.get(base_url, token)
+        if cached is not _MISSING:
+            return cached
+
+        key = self.make_key(base_url, token)
+        task = self._inflight.get(key)
+        if task is None:
+            with self._lock:
+                self.misses += 1
+            # Run the upstream call as its own task so a cancelled caller
+            # does not cancel it for everyone else waiting on it.
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._settle(key, t))
+        else:
+            with self._lock:
+                self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _settle(self, key: str, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._store(key, task.result())
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits + self.negative_hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+def is_missing(value) -> bool:
+    return value is _MISSING
+
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL,
+    negative_ttl=settings.TOKEN_CACHE_NEGATIVE_TTL,
+)
@@ -0,0 +1,112 @@
+import logging
+import re
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Set
+
+from app.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+def query_shape(value: Any) -> Any:
+    """
+    Structure of Prisma query arguments with every value replaced by "?", e.g.
+    {"where": {"shot_id": "?", "task_id": "?"}, "take": "?"}. Two queries with the
+    same shape differ only in their parameters.
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [query_shape(value[0])] if value and isinstance(value[0], dict) else "?"
+    return "?"
+
+def describe(model: str, operation: str, arguments: Optional[dict]) -> str:
+    arguments = arguments or {}
+    if "query" in arguments:
+        # Raw SQL: the statement text already is its shape
+        return f"{model}.{operation} {_WHITESPACE.sub(' ', str(arguments['query'])).strip()[:300]}"
+    shape = {key: query_shape(arguments[key]) for key in ("where", "include", "select") if arguments.get(key)}
+    return f"{model}.{operation} {shape}"
+
+class QueryTrace:
+    """
+    Queries issued while handling one request: count, total time and how often
+    each query shape repeated.
+    """
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Dict[str, int] = {}
+        self._warned: Set[str] = set()
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return "background"
+        return f"{self.scope.get('method', '')} {route_template(self.scope)}".strip()
+
+    def record(self, description: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        repeats = self.shapes.get(description, 0) + 1
+        self.shapes[description] = repeats
+        if repeats > settings.DB_N_PLUS_ONE_THRESHOLD and description not in self._warned:
+            self._warned.add(description)
+            logger.warning(
+                f"Possible N+1 on {self.route}: more than {settings.DB_N_PLUS_ONE_THRESHOLD} queries shaped "
+                f"like {description}; batch them into one query"
+            )
+
+_current: ContextVar[Optional[QueryTrace]] = ContextVar("query_trace", default=None)
+
+def current_trace() -> Optional[QueryTrace]:
+    return _current.get()
+
+def record_query(model: str, operation: str, arguments: Optional[dict], elapsed: float):
+    """
+    Called by the Prisma client after every query.
+    """
+    trace = _current.get()
+    description = describe(model, operation, arguments)
+    if trace is not None:
+        trace.record(description, elapsed)
+    if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        route = trace.route if trace is not None else "background"
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms) on {route}: {description}")
+
+class QueryTraceMiddleware:
+    """
+    ASGI middleware giving every request its own QueryTrace. With DB_DEBUG_HEADERS,
+    responses carry X-DB-Query-Count, X-DB-Time-Ms and a Server-Timing `db` entry
+    (queries issued while a streaming body is still being sent are not included).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = QueryTrace(scope)
+        token = _current.set(trace)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DB_DEBUG_HEADERS:
+                total_ms = f"{trace.total_time * 1000:.1f}"
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(trace.count).encode()))
+                headers.append((b"x-db-time-ms", total_ms.encode()))
+                headers.append((b"server-timing", f'db;dur={total_ms};desc="{trace.count} queries"'.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
\ No newline at end of file
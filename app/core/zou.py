@@ -0,0 +1,221 @@
+import asyncio
+import importlib.util
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _http2_enabled() -> bool:
+    if not settings.ZOU_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("ZOU_HTTP2 is enabled but the 'h2' package is not installed, using HTTP/1.1")
+        return False
+    return True
+
+class InFlightTransport(httpx.AsyncBaseTransport):
+    """
+    Transport counting the requests in flight on a client, from sending the request
+    until its response is closed, so the registry can close evicted clients once idle.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def _release(self):
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+        response.stream = _ReleasingStream(response.stream, self._release)
+        return response
+
+    async def wait_idle(self):
+        await self._idle.wait()
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                release, self._release = self._release, None
+                release()
+
+def build_transport() -> InFlightTransport:
+    """
+    Connection pool of one Zou client, with the pool limits and keep-alive from settings.
+    """
+    return InFlightTransport(httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=settings.ZOU_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.ZOU_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.ZOU_POOL_KEEPALIVE_EXPIRY,
+        ),
+        http2=_http2_enabled(),
+    ))
+
+def build_client(base_url: str, transport: Optional[InFlightTransport] = None) -> httpx.AsyncClient:
+    """
+    Build a pooled async client for a Zou instance.
+    Pool limits, keep-alive and timeouts come from settings.
+    """
+    return httpx.AsyncClient(
+        base_url=base_url,
+        transport=transport or build_transport(),
+        timeout=httpx.Timeout(
+            settings.ZOU_TIMEOUT,
+            connect=settings.ZOU_CONNECT_TIMEOUT,
+            pool=settings.ZOU_POOL_TIMEOUT,
+        ),
+        headers={"Accept": "application/json"},
+    )
+
+def normalize_base_url(base_url: str) -> str:
+    return base_url.strip().rstrip("/")
+
+class ZouClientRegistry:
+    """
+    Keyed registry of pooled clients, one per Zou base URL.
+
+    Requests may target several Zou instances (see the X-Zou-Url header), so each
+    instance gets its own connection pool and a slow one cannot exhaust the pool
+    of another. Clients unused for ZOU_CLIENT_IDLE_TIMEOUT seconds are closed by
+    a background task; the configured ZOU_API_URL client is never evicted.
+    An evicted client is only closed once the requests still running on it are done.
+    """
+
+    def __init__(self, idle_timeout: float, max_clients: int):
+        self.idle_timeout = idle_timeout
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[str, httpx.AsyncClient]" = OrderedDict()
+        self._transports: Dict[str, InFlightTransport] = {}
+        self._last_used: dict = {}
+        self._closing: Set[asyncio.Task] = set()
+        self._evict_task: Optional[asyncio.Task] = None
+
+    @property
+    def pinned_url(self) -> str:
+        return normalize_base_url(settings.ZOU_API_URL)
+
+    def get(self, base_url: str) -> httpx.AsyncClient:
+        key = normalize_base_url(base_url)
+        client = self._clients.get(key)
+        created = client is None or client.is_closed
+        if created:
+            transport = build_transport()
+            client = build_client(key, transport)
+            self._clients[key] = client
+            self._transports[key] = transport
+        self._clients.move_to_end(key)
+        self._last_used[key] = time.monotonic()
+        if created:
+            self._evict_overflow()
+        return client
+
+    def _evict_overflow(self):
+        for key in list(self._clients)[:-1]:
+            if len(self._clients) <= self.max_clients:
+                break
+            if key == self.pinned_url:
+                continue
+            self._close_later(key)
+
+    def _close_later(self, key: str):
+        """
+        Drop the client of `key` from the registry, so new requests get a fresh one,
+        and close it in the background once its in-flight requests have finished.
+        """
+        client = self._clients.pop(key)
+        transport = self._transports.pop(key)
+        self._last_used.pop(key, None)
+        try:
+            task = asyncio.get_running_loop().create_task(self._close_when_idle(client, transport))
+        except RuntimeError:
+            return
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_when_idle(client: httpx.AsyncClient, transport: InFlightTransport):
+        await transport.wait_idle()
+        await client.aclose()
+
+    async def evict_idle(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, last_used in list(self._last_used.items()):
+            if key != self.pinned_url and last_used < cutoff and self._transports[key].in_flight == 0:
+                logger.info(f"Closing idle Zou client for {key}")
+                self._close_later(key)
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 2, 1.0))
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"Error while evicting idle Zou clients: {e}")
+
+    async def start(self):
+        self.get(settings.ZOU_API_URL)
+        if self._evict_task is None:
+            self._evict_task = asyncio.create_task(self._evict_loop())
+
+    async def aclose(self):
+        if self._evict_task is not None:
+            self._evict_task.cancel()
+            self._evict_task = None
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._transports.clear()
+        self._last_used.clear()
+        # Evicted clients close as soon as their last request is done
+        await asyncio.gather(*self._closing, return_exceptions=True)
+        for client in clients:
+            await client.aclose()
+
+zou_clients = ZouClientRegistry(
+    idle_timeout=settings.ZOU_CLIENT_IDLE_TIMEOUT,
+    max_clients=settings.ZOU_MAX_CLIENTS,
+)
+
+async def open_zou_client():
+    await zou_clients.start()
+
+async def close_zou_client():
+    await zou_clients.aclose()
+
+def get_zou_client(base_url: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    Return the pooled client for a Zou instance, defaulting to ZOU_API_URL.
+    Clients are opened lazily, so this also works outside the app lifespan.
+    """
+    return zou_clients.get(base_url or settings.ZOU_API_URL)
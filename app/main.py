@@ -1,17 +1,54 @@
 from fastapi import FastAPI
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 from app.routers.v1.routers import api_router
-from app.core import prisma
+from app.core import prisma, zou
+from app.core.nas_cache import nas_cache
+from app.core.events import broker
+from app.config import settings
+from app.core.responses import FastJSONResponse
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.tracing import QueryTraceMiddleware
+from app.core.read_routing import ReadRoutingMiddleware
+from app.core.compression import CompressionMiddleware
+from app.services.retention import retention
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🔌 Connecting to Prisma...")
     await prisma.connect_db()
+    await prisma.warm_up(settings.DB_WARMUP_CONNECTIONS)
+    if prisma.replica is not None:
+        await prisma.warm_up(settings.DB_WARMUP_CONNECTIONS, prisma.replica)
+    await nas_cache.load()
+    await zou.open_zou_client()
+    await broker.start()
+    await retention.start()
     yield
+    await retention.stop()
+    await broker.stop()
+    await zou.close_zou_client()
     print("🔌 Disconnecting from Prisma...")
     await prisma.disconnect_db()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(QueryTraceMiddleware)
+
+if settings.DATABASE_READ_URL:
+    app.add_middleware(ReadRoutingMiddleware)
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """
+        Prometheus scrape endpoint with the metrics of this worker.
+        """
+        return Response(content=registry.render(), media_type=CONTENT_TYPE)
 
 @app.get("/")
 async def root():
@@ -5,7 +5,7 @@ from typing import Optional
 router = APIRouter()
 
 @router.get("/protected-data")
-def get_protected_data(
+async def get_protected_data(
     request: Request,
     current_user: dict = Depends(get_current_user)
 ):
@@ -25,7 +25,7 @@ def get_protected_data(
     }
 
 @router.get("/public-data")
-def get_public_data(
+async def get_public_data(
     request: Request,
     current_user: Optional[dict] = Depends(get_optional_current_user)
 ):
@@ -44,7 +44,7 @@ def get_public_data(
     return response
 
 @router.post("/create-item")
-def create_item(
+async def create_item(
     item_data: dict,
     request: Request,
     current_user: dict = Depends(get_current_user)
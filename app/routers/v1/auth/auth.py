@@ -9,7 +9,7 @@ from app.core.dependencies import get_current_user
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login(payload: LoginRequest):
+async def login(payload: LoginRequest):
     """
     Login endpoint to authenticate users.
     """
@@ -17,7 +17,7 @@ def login(payload: LoginRequest):
     password = payload.password
     zou_url = payload.zou_url
 
-    response, cookies = verify_login_kitsu(email, password, zou_url)
+    response, cookies = await verify_login_kitsu(email, password, zou_url)
 
     if not isinstance(response, dict) or "access_token" not in response:
         raise HTTPException(
@@ -52,7 +52,7 @@ def logout():
     return res
 
 @router.get("/validate")
-def get_current_user_info(
+async def get_current_user_info(
     request: Request,
     current_user: dict = Depends(get_current_user)
 ):
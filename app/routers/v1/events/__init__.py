@@ -0,0 +1 @@
+# auto-generated __init__.py
\ No newline at end of file
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, HTTPException, Depends, status, Request, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.config import settings
+from app.core.events import EventFilter, broker
+from app.core.responses import FastJSONResponse, dumps
+from app.services.auth import AuthService
+
+router = APIRouter()
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+def event_filter(
+    project_id: Optional[str] = Query(None, description="Only events of this project"),
+    shot_id: Optional[str] = Query(None, description="Only events of this shot"),
+    task_id: Optional[str] = Query(None, description="Only events of this task"),
+) -> EventFilter:
+    return EventFilter(project_id, shot_id, task_id)
+
+def sse_frame(event: Optional[dict]) -> bytes:
+    if event is None:
+        return b": keep-alive\n\n"
+    return b"id: " + event["id"].encode() + b"\nevent: " + event["type"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+
+@router.get("/stream", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def stream_events(
+    request: Request,
+    filters: EventFilter = Depends(event_filter),
+    last_event_id: Optional[str] = Query(None, description="Resume after this event id (same as the Last-Event-ID header)")
+):
+    """
+    Server-Sent Events feed of master shot and version shot changes:
+    created, updated, locked, unlocked, committed and deleted.
+    On reconnect, send Last-Event-ID to receive the events missed in between.
+    A `resync` event means they are no longer buffered and the client should reload.
+    """
+    subscription = broker.subscribe(filters, request.headers.get("last-event-id") or last_event_id)
+
+    async def frames():
+        yield b"retry: 2000\n\n"
+        async for event in broker.listen(subscription, settings.EVENTS_KEEPALIVE):
+            yield sse_frame(event)
+
+    return StreamingResponse(
+        frames(),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    filters: EventFilter = Depends(event_filter),
+    last_event_id: Optional[str] = Query(None, description="Resume after this event id"),
+    token: Optional[str] = Query(None, description="Bearer token, for clients that cannot set headers")
+):
+    """
+    WebSocket variant of /stream. Every message is one JSON event; keep-alives are
+    {"type": "keep-alive"}. Authenticate with the Authorization header or ?token=.
+    """
+    auth_header = websocket.headers.get("Authorization") or ""
+    if auth_header.startswith("Bearer "):
+        token = auth_header.split(" ")[1]
+    try:
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
+        await AuthService.verify_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = broker.subscribe(filters, last_event_id)
+    try:
+        async for event in broker.listen(subscription, settings.EVENTS_KEEPALIVE):
+            await websocket.send_bytes(dumps(event if event is not None else {"type": "keep-alive"}))
+        # The subscriber fell too far behind; the client reconnects with its last event id
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        broker.unsubscribe(subscription)
+
+@router.get("/stats", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_event_stats():
+    """
+    Connected subscribers and buffered events of this worker.
+    """
+    try:
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Event feed stats retrieved successfully!",
+            "data": broker.stats()
+        }, status_code=200)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
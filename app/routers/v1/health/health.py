@@ -0,0 +1,52 @@
+import asyncio
+from fastapi import APIRouter, status
+from app.config import settings
+from app.core import prisma
+from app.core.responses import FastJSONResponse
+
+router = APIRouter()
+
+@router.get("/live", status_code=status.HTTP_200_OK)
+async def liveness():
+    """
+    Liveness probe: the worker's event loop is responding. Does not touch the database,
+    so a database outage does not get healthy workers restarted.
+    """
+    return FastJSONResponse(content={"success": True, "message": "alive"}, status_code=200)
+
+async def replica_status() -> dict:
+    status_data = {}
+    try:
+        if not prisma.replica.is_connected():
+            raise ConnectionError("Read replica is not connected")
+        status_data["db_ms"] = await prisma.ping(settings.DB_READY_TIMEOUT, prisma.replica)
+    except asyncio.TimeoutError:
+        status_data["error"] = f"Replica probe took longer than {settings.DB_READY_TIMEOUT}s"
+    except Exception as e:
+        status_data["error"] = str(e)
+    status_data["pool"] = prisma.replica_pool_stats.as_dict()
+    return status_data
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness():
+    """
+    Readiness probe: the database answers `SELECT 1` within DB_READY_TIMEOUT seconds.
+    Reports the probe time (pool wait included) and the pool usage of this worker;
+    returns 503 when the database is unreachable or the pool is too saturated to answer.
+    The read replica is probed and reported too, but does not decide readiness:
+    while it fails, reads go to the primary.
+    """
+    data = {"pool": prisma.pool_stats.as_dict()}
+    try:
+        if not prisma.db.is_connected():
+            raise ConnectionError("Prisma is not connected")
+        data["db_ms"] = await prisma.ping(settings.DB_READY_TIMEOUT)
+        data["pool"] = prisma.pool_stats.as_dict()
+        if prisma.replica is not None:
+            data["replica"] = await replica_status()
+        return FastJSONResponse(content={"success": True, "message": "ready", "data": data}, status_code=200)
+    except asyncio.TimeoutError:
+        data["error"] = f"Database probe took longer than {settings.DB_READY_TIMEOUT}s"
+    except Exception as e:
+        data["error"] = str(e)
+    return FastJSONResponse(content={"success": False, "message": "not ready", "data": data}, status_code=503)
\ No newline at end of file
@@ -1,29 +1,44 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Request
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, HTTPException, Depends, Query, status, Request
 from app.config import settings
 from app.core.prisma import db
+from app.core.read_routing import reader
+from app.core.responses import FastJSONResponse
+from app.core.pagination import PageParams, paginate, paginate_list
+from app.core.nas_cache import nas_cache
 from app.services.auth import AuthService
+from app.schemas.responses import DataResponse, PageResponse
+from app.schemas.nas import NasServerResponse
+from app.schemas.shots import NasServerWithShotsResponse
 
 router = APIRouter()
 
-@router.get("/list", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def list_nas():
+@router.get("/list", response_model=PageResponse[NasServerWithShotsResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def list_nas(
+    page: PageParams = Depends(),
+    include_master_shots: bool = Query(False, description="Also return every master shot stored on each NAS"),
+):
     """
-    Endpoint to list all NAS entries.
-    This endpoint can be used to retrieve all NAS entries from the system.
+    Endpoint to list NAS entries, one page at a time.
+    Pass the returned next_cursor as `cursor` to fetch the following page.
+    Served from the NAS cache unless include_master_shots is set.
     """
     try:
-        nas_entries = await db.nasserver.find_many(include={"master_shots": True})
-        return JSONResponse(content={
+        if include_master_shots:
+            nas_entries, next_cursor = await paginate(reader().nasserver, page, include={"master_shots": True})
+        else:
+            nas_entries, next_cursor = paginate_list(await nas_cache.all(), page)
+        return FastJSONResponse(content={
             "success": True,
             "message": "NAS entries retrieved successfully!",
-            "data": jsonable_encoder(nas_entries)
+            "data": nas_entries,
+            "next_cursor": next_cursor
         }, status_code=200)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/create", status_code=status.HTTP_201_CREATED, dependencies=[Depends(AuthService.verify_user_token)])
+@router.post("/create", response_model=DataResponse[NasServerResponse], status_code=status.HTTP_201_CREATED, dependencies=[Depends(AuthService.verify_user_token)])
 async def create_nas(request: Request):
     """
     Endpoint to create a NAS entry.
@@ -32,10 +47,11 @@ async def create_nas(request: Request):
     try:
         data = await request.json()
         nas_entry = await db.nasserver.create(data)
-        return JSONResponse(content={
+        nas_cache.invalidate()
+        return FastJSONResponse(content={
             "success": True,
             "message": "NAS entry created successfully!",
-            "data": jsonable_encoder(nas_entry)
+            "data": nas_entry
         }, status_code=201)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
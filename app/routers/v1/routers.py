@@ -3,6 +3,8 @@ from app.routers.v1.auth import auth
 from app.routers.v1.zou import api
 from app.routers.v1.shots import shots
 from app.routers.v1.nas import nas
+from app.routers.v1.events import events
+from app.routers.v1.health import health
 from app.routers.v1.__test__ import example
 
 api_router = APIRouter()
@@ -10,5 +12,7 @@ api_router.include_router(api.router, prefix="/zou", tags=["zou"])
 api_router.include_router(shots.router, prefix="/shots", tags=["shots"])
 api_router.include_router(nas.router, prefix="/nas", tags=["nas"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(health.router, prefix="/health", tags=["health"])
 
 api_router.include_router(example.router, prefix="/test", tags=["test"])
\ No newline at end of file
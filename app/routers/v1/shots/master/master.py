@@ -1,13 +1,35 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Request, Path
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, HTTPException, Depends, status, Request, Path, Query
+from typing import Optional
+from datetime import datetime
 from app.config import settings
 from app.core.prisma import db
+from app.core.read_routing import read_only, reader
+from app.core.responses import FastJSONResponse
+from app.core.pagination import PageParams, paginate
+from app.core.streaming import ndjson_response, iter_rows, export_where
+from app.core.fields import Selection, sparse_fields
+from app.core.filters import HierarchyFilter
+from app.core.conditional import mastershot_validator, not_modified, with_validator
+from app.core.nas_cache import nas_cache
+from app.core.events import broker
 from app.services.auth import AuthService
+from app.services.shots import ShotService
+from app.schemas.responses import DataResponse, PageResponse
+from app.schemas.shots import MasterShotResponse
 
 router = APIRouter()
 
-@router.post("/create", status_code=status.HTTP_201_CREATED, dependencies=[Depends(AuthService.verify_user_token)])
+# nas_server is attached from the in-process NAS cache instead of being joined
+master_fields = sparse_fields(
+    "MasterShot", default_include={"nas_server": True}, cached_relations={"nas_server": "nas_server_id"}
+)
+
+async def with_nas_servers(selection: Selection, mastershots):
+    if "nas_server" not in selection.cached:
+        return mastershots
+    return await nas_cache.attach(mastershots)
+
+@router.post("/create", response_model=DataResponse[MasterShotResponse], status_code=status.HTTP_201_CREATED, dependencies=[Depends(AuthService.verify_user_token)])
 async def create_mastershot(request: Request):
     """
     Endpoint to create a master shot.
@@ -26,120 +48,136 @@ async def create_mastershot(request: Request):
         )
 
         if existing:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=200,
                 content={
                     "success": False,
                     "exist": True,
                     "message": "Master shot with this file name and path already exists.",
-                    "data": jsonable_encoder(existing)
+                    "data": existing
                 }
             )
 
-        mastershot = await db.mastershot.create(data, include={"nas_server": True})
-        print(mastershot)
+        mastershot = await nas_cache.attach_one(await db.mastershot.create(data))
+        await broker.publish("MasterShot", "created", mastershot)
 
         # Here you would typically process the data and save it to a database
         # For demonstration, we will just return the received data
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": "Master shot created successfully!",
-            "data": jsonable_encoder(mastershot)
+            "data": mastershot
         }, status_code=201)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{mastershot_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def get_mastershot(mastershot_id: str = Path(..., description="ID of the master shot to retrieve")):
+@router.post("/batch", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token), Depends(read_only)])
+async def get_mastershots_batch(request: Request):
     """
-    Endpoint to retrieve a single master shot by ID with its NAS info and latest version shot.
+    Endpoint to retrieve many master shots by (shot_id, task_id) in one request.
+    Body: {"pairs": [{"shot_id": ..., "task_id": ...}, ...], "with_latest_version": false}.
+    Returns a map keyed by "shot_id:task_id"; pairs without a master shot map to null.
     """
     try:
-        # Get mastershot with NAS info
-        mastershot = await db.mastershot.find_first(
-            where={"id": mastershot_id},
-            include={"nas_server": True}
-        )
-
-        if not mastershot:
-            raise HTTPException(status_code=404, detail=f"MasterShot with ID '{mastershot_id}' not found.")
+        data = await request.json()
+        pairs = data.get("pairs") if isinstance(data, dict) else None
+        if not isinstance(pairs, list):
+            raise HTTPException(status_code=400, detail="pairs must be a list")
+        if not all(isinstance(p, dict) and p.get("shot_id") and p.get("task_id") for p in pairs):
+            raise HTTPException(status_code=400, detail="Each pair requires shot_id and task_id")
 
-        # Get latest version shot linked to this mastershot
-        latest_versionshot = await db.versionshot.find_first(
-            where={"master_shot_id": mastershot_id},
-            order={"version_number": "desc"}
+        mastershots = await ShotService.find_by_pairs(
+            [(p["shot_id"], p["task_id"]) for p in pairs],
+            with_latest_version=bool(data.get("with_latest_version", False))
         )
 
-        # Attach latest version to mastershot under a new key
-        mastershot_dict = jsonable_encoder(mastershot)
-        mastershot_dict["latest_version_shot"] = jsonable_encoder(latest_versionshot) if latest_versionshot else None
-
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
-            "message": "Master shot retrieved successfully!",
-            "data": mastershot_dict
+            "message": "Master shots retrieved successfully!",
+            "data": mastershots
         }, status_code=200)
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list", status_code =status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def list_mastershots():
+@router.get("/list", response_model=PageResponse[MasterShotResponse], status_code =status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def list_mastershots(page: PageParams = Depends(), selection: Selection = Depends(master_fields)):
     """
-    Endpoint to list all master shots.
-    This endpoint can be used to retrieve all master shots from the system.
+    Endpoint to list master shots, one page at a time.
+    Pass the returned next_cursor as `cursor` to fetch the following page.
     """
     try:
-        mastershots = await db.mastershot.find_many(include={"nas_server": True})
-        return JSONResponse(content={
+        mastershots, next_cursor = await paginate(selection.delegate(reader().mastershot, keyset=True), page, include=selection.include)
+        mastershots = await with_nas_servers(selection, mastershots)
+        return FastJSONResponse(content={
             "success": True,
             "message": "Master shots retrieved successfully!",
-            "data": jsonable_encoder(mastershots)
+            "data": mastershots,
+            "next_cursor": next_cursor
         }, status_code=200)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list/{shot_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def get_version_shot_by_shot_id(shot_id: str = Path(..., description="ID of the shot to retrieve")):
+@router.get("/list/{shot_id}", response_model=DataResponse[MasterShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_version_shot_by_shot_id(
+    shot_id: str = Path(..., description="ID of the shot to retrieve"),
+    selection: Selection = Depends(master_fields)
+):
     """
     Endpoint to retrieve a single master shot by shot_id.
     Requires Bearer token authentication.
     """
     try:
-        master_shot = await db.mastershot.find_first(where={"shot_id": shot_id}, include={"nas_server": True})
+        master_shot = await selection.delegate(reader().mastershot).find_first(where={"shot_id": shot_id}, include=selection.include)
         if not master_shot:
             raise HTTPException(status_code=404, detail=f"MasterShot with shot_id '{shot_id}' not found.")
+        master_shot = (await with_nas_servers(selection, [master_shot]))[0]
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": "Master shot retrieved successfully!",
-            "data": jsonable_encoder(master_shot)
+            "data": master_shot
         }, status_code=200)
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list/{shot_id}/tasks/{task_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def get_version_shot_by_shot_id(shot_id: str = Path(..., description="ID of the shot to retrieve"), task_id: str = Path(..., description="ID of the task to retrieve")):
+@router.get("/list/{shot_id}/tasks/{task_id}", response_model=DataResponse[MasterShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_version_shot_by_shot_id(
+    shot_id: str = Path(..., description="ID of the shot to retrieve"),
+    task_id: str = Path(..., description="ID of the task to retrieve"),
+    selection: Selection = Depends(master_fields)
+):
     """
     Endpoint to retrieve a single master shot by shot_id and task_id.
     Requires Bearer token authentication.
     """
     try:
-        master_shot = await db.mastershot.find_first(where={"shot_id": shot_id, "task_id": task_id}, include={"nas_server": True})
+        master_shot = await selection.delegate(reader().mastershot).find_first(where={"shot_id": shot_id, "task_id": task_id}, include=selection.include)
         if not master_shot:
             raise HTTPException(status_code=404, detail=f"MasterShot with shot_id '{shot_id}' and task_id '{task_id}' not found.")
+        master_shot = (await with_nas_servers(selection, [master_shot]))[0]
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": "Master shot retrieved successfully!",
-            "data": jsonable_encoder(master_shot)
+            "data": master_shot
         }, status_code=200)
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.patch("/update/{shot_id}/tasks/{task_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+@router.patch("/update/{shot_id}/tasks/{task_id}", response_model=DataResponse[MasterShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
 async def update_mastershot(shot_id: str, task_id: str, request: Request):
     """
     Endpoint to update a master shot by shot_id and task_id.
@@ -154,13 +192,16 @@ async def update_mastershot(shot_id: str, task_id: str, request: Request):
         )
         if not updated_mastershot:
             raise HTTPException(status_code=404, detail=f"MasterShot with shot_id '{shot_id}' and task_id '{task_id}' not found.")
+        await broker.publish("MasterShot", "updated", updated_mastershot)
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": "Master shot updated successfully!",
-            "data": jsonable_encoder(updated_mastershot)
+            "data": updated_mastershot
         }, status_code=200)
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -171,34 +212,133 @@ async def delete_mastershot(shot_id: str, task_id: str):
     Requires Bearer token authentication.
     """
     try:
-        deleted_mastershot = await db.mastershot.delete(where={"shot_id": shot_id, "task_id": task_id})
+        deleted_mastershot = await db.mastershot.delete(where={"shot_id_task_id": {"shot_id": shot_id, "task_id": task_id}})
         if not deleted_mastershot:
             raise HTTPException(status_code=404, detail=f"MasterShot with shot_id '{shot_id}' and task_id '{task_id}' not found.")
+        await broker.publish("MasterShot", "deleted", deleted_mastershot)
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": "Master shot deleted successfully!"
         }, status_code=204)
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list/projects/{project_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def get_version_shot_by_project_id(project_id: str = Path(..., description="ID of the shot to retrieve")):
+@router.get("/list/projects/{project_id}", response_model=DataResponse[MasterShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_version_shot_by_project_id(
+    project_id: str = Path(..., description="ID of the shot to retrieve"),
+    selection: Selection = Depends(master_fields)
+):
     """
     Endpoint to retrieve a single master shot by project_id.
     Requires Bearer token authentication.
     """
     try:
-        master_shot = await db.mastershot.find_first(where={"project_id": project_id}, include={"nas_server": True})
+        master_shot = await selection.delegate(reader().mastershot).find_first(where={"project_id": project_id}, include=selection.include)
         if not master_shot:
             raise HTTPException(status_code=404, detail=f"MasterShot with shot_id '{project_id}' not found.")
+        master_shot = (await with_nas_servers(selection, [master_shot]))[0]
+
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Master shot retrieved successfully!",
+            "data": master_shot
+        }, status_code=200)
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/projects/{project_id}/dashboard", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_project_dashboard(project_id: str = Path(..., description="ID of the project")):
+    """
+    Endpoint to retrieve every master shot of a project with its NAS server and latest
+    version shot, grouped by episode and sequence. Built from a single query.
+    """
+    try:
+        tree = await ShotService.project_tree(project_id)
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Project dashboard retrieved successfully!",
+            "data": tree
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return JSONResponse(content={
+@router.get("/filter", response_model=PageResponse[MasterShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def filter_mastershots(
+    filters: HierarchyFilter = Depends(),
+    page: PageParams = Depends(),
+    selection: Selection = Depends(master_fields)
+):
+    """
+    Endpoint to list master shots filtered by project, episode, sequence, shot, task
+    and update time, one page at a time.
+    """
+    try:
+        mastershots, next_cursor = await paginate(
+            selection.delegate(reader().mastershot, keyset=True), page, where=filters.where(), include=selection.include
+        )
+        mastershots = await with_nas_servers(selection, mastershots)
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Master shots retrieved successfully!",
+            "data": mastershots,
+            "next_cursor": next_cursor
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/export", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def export_mastershots(
+    project_id: Optional[str] = Query(None, description="Only export rows of this project"),
+    since: Optional[datetime] = Query(None, description="Only export rows updated at or after this time")
+):
+    """
+    Endpoint to export every master shot as newline-delimited JSON.
+    Rows are streamed from the database in chunks, so memory stays flat regardless of project size.
+    """
+    return ndjson_response(iter_rows(reader().mastershot, where=export_where(project_id, since)))
+
+@router.get("/{mastershot_id}", response_model=DataResponse[MasterShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_mastershot(
+    request: Request,
+    mastershot_id: str = Path(..., description="ID of the master shot to retrieve"),
+    selection: Selection = Depends(master_fields)
+):
+    """
+    Endpoint to retrieve a single master shot by ID with its NAS info and latest version shot.
+    Master, NAS server and latest version are read in a single query.
+    Supports If-None-Match / If-Modified-Since, answered with 304 from a single aggregate query.
+    """
+    try:
+        validator = await mastershot_validator(mastershot_id, variant=request.url.query)
+        cached = not_modified(request, validator)
+        if cached:
+            return cached
+
+        mastershot = await ShotService.get_with_latest(mastershot_id)
+        if not mastershot:
+            raise HTTPException(status_code=404, detail=f"MasterShot with ID '{mastershot_id}' not found.")
+
+        mastershot_dict = selection.project(mastershot, extra=("latest_version_shot",))
+
+        response = FastJSONResponse(content={
             "success": True,
             "message": "Master shot retrieved successfully!",
-            "data": jsonable_encoder(master_shot)
+            "data": mastershot_dict
         }, status_code=200)
+        return with_validator(response, validator)
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,17 +1,45 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Request, Path
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, HTTPException, Depends, status, Request, Path, Query
+from typing import List, Optional
+from datetime import datetime
 from app.config import settings
 from app.core.prisma import db
+from app.core.read_routing import reader
+from app.core.responses import FastJSONResponse
+from app.core.pagination import PageParams, paginate
+from app.core.streaming import ndjson_response, iter_rows, export_where
+from app.core.fields import Selection, sparse_fields
+from app.core.filters import VersionFilter
+from app.core.conditional import versions_validator, not_modified, with_validator
+from app.core.events import broker
 from app.services.auth import AuthService
+from app.services.versions import VersionService
+from app.services.locks import LockService, lease_seconds
+from app.services.retention import retention
+from app.schemas.responses import DataResponse, PageResponse
+from app.schemas.shots import VersionShotResponse
 
 router = APIRouter()
 
-@router.post("/create", status_code=status.HTTP_201_CREATED, dependencies=[Depends(AuthService.verify_user_token)])
+version_fields = sparse_fields("VersionShot")
+
+def version_change(data: dict) -> str:
+    """
+    Change feed action of a version shot PATCH.
+    """
+    return "committed" if data.get("commited") else "updated"
+
+async def lock_request(request: Request) -> dict:
+    data = await request.json()
+    if not isinstance(data, dict) or not data.get("edit_user_id"):
+        raise HTTPException(status_code=400, detail="edit_user_id is required")
+    return data
+
+@router.post("/create", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_201_CREATED, dependencies=[Depends(AuthService.verify_user_token)])
 async def create_versionshot(request: Request):
     """
     Endpoint to create a version shot.
-    Automatically assigns the next version number based on shot_id and task_id.
+    Automatically assigns the next version number based on shot_id and task_id,
+    atomically, so concurrent publishes never collide on a version number.
     Prevents duplicate file_path and file_name.
     """
     try:
@@ -27,43 +55,18 @@ async def create_versionshot(request: Request):
         if not file_path or not file_name:
             raise HTTPException(status_code=400, detail="file_path and file_name are required")
 
-        # Explicit AND condition
-        existing = await db.versionshot.find_first(
-            where={
-                "AND": [
-                    {"file_name": file_name},
-                    {"file_path": file_path}
-                ]
-            }
-        )
-
-        if existing:
-            raise HTTPException(
-                status_code=409,
-                detail="VersionShot with the same file_name and file_path already exists."
-            )
-
-        # Find latest version
+        # Allocate the version number and insert in one atomic statement
         if "version_number" not in data:
-            latest_version = await db.versionshot.find_first(
-                where={
-                    "shot_id": shot_id,
-                    "task_id": task_id
-                },
-                order={"version_number": "desc"}
-            )
-            next_version_number = 0 if latest_version is None else latest_version.version_number + 1
-            data["version_number"] = next_version_number
+            versionshot = await VersionService.create_next_version(data)
         else:
-            next_version_number = data["version_number"]
+            versionshot = await VersionService.create_with_version(data)
+        next_version_number = versionshot.version_number
+        await broker.publish("VersionShot", "created", versionshot)
 
-        # Create version shot
-        versionshot = await db.versionshot.create(data, include={"master_shot": True})
-
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": f"Version {next_version_number} for shot '{shot_id}' and task '{task_id}' created successfully!",
-            "data": jsonable_encoder(versionshot)
+            "data": versionshot
         }, status_code=201)
 
     except HTTPException as he:
@@ -71,32 +74,50 @@ async def create_versionshot(request: Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{versionshot_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def get_versionshot(versionshot_id: str = Path(..., description="ID of the version shot")):
+@router.post("/create/batch", status_code=status.HTTP_201_CREATED, dependencies=[Depends(AuthService.verify_user_token)])
+async def create_versionshots_batch(request: Request):
     """
-    Endpoint to retrieve a specific version shot by its ID.
+    Endpoint to publish many version shots in one request.
+    Body: {"versions": [<same payload as /create>, ...]}.
+    Version numbers are allocated per shot_id/task_id group and every row is inserted
+    in one transaction. Returns a result per item, in the order they were sent.
     """
     try:
-        versionshot = await db.versionshot.find_first(where={"id": versionshot_id})
-        if not versionshot:
-            raise HTTPException(status_code=404, detail=f"Version shot with ID '{versionshot_id}' not found.")
+        data = await request.json()
+        items = data.get("versions") if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            raise HTTPException(status_code=400, detail="versions must be a non-empty list")
 
-        return JSONResponse(content={
-            "success": True,
-            "message": "Version shot retrieved successfully!",
-            "data": jsonable_encoder(versionshot)
-        }, status_code=200)
+        results = await VersionService.create_batch(items)
+        created = sum(1 for r in results if r["success"])
+        await broker.publish_many("VersionShot", "created", [
+            {**items[r["index"]], **{k: v for k, v in r.items() if k not in ("index", "success", "status")}}
+            for r in results if r["success"]
+        ])
+
+        return FastJSONResponse(content={
+            "success": created == len(results),
+            "message": f"{created} of {len(results)} version shots created.",
+            "data": results
+        }, status_code=201 if created == len(results) else 207)
+
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.patch("/{versionshot_id}", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(AuthService.verify_user_token)])
+@router.patch("/{versionshot_id}", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(AuthService.verify_user_token)])
 async def update_versionshot(
     request: Request,
     versionshot_id: str = Path(..., description="ID of the version shot")
 ):
     """
     Endpoint to update a specific version shot by its ID.
-    If the version is locked, only the user who locked it can update.
+    If the version is locked, only the user who locked it can update, until the lock expires.
+    Keys that cannot be updated (version_number, ids, ...) are rejected with a 400 naming them.
+    Lock state (locked, locked_by_user_id, locked_by_user_name) is no longer set here: locks
+    taken through /lock carry a VERSION_LOCK_LEASE lease kept alive with /heartbeat, which a
+    PATCH-set lock would never get.
     """
     try:
         data = await request.json()
@@ -105,33 +126,14 @@ async def update_versionshot(
         if not edit_user_id:
             raise HTTPException(status_code=400, detail="edit_user_id is required")
 
-        # Get current version shot from DB
-        current = await db.versionshot.find_unique(where={"id": versionshot_id})
-        if not current:
-            raise HTTPException(status_code=404, detail=f"Version shot with ID '{versionshot_id}' not found.")
-
-        if current.commited:
-            raise HTTPException(status_code=400, detail="Cannot update a committed version shot.")
-
-        # If locked, only the locker can update
-        if current.locked:
-            if current.locked_by_user_id != edit_user_id:
-                raise HTTPException(
-                    status_code=403,
-                    detail=f"This version shot is locked by another user: {current.locked_by_user_name}"
-                )
-
-        # Perform the update
-        updated = await db.versionshot.update(
-            where={"id": versionshot_id},
-            data=data,
-            include={"master_shot": True}
-        )
+        # Lock check and write happen in one conditional statement
+        updated = await VersionService.update(versionshot_id, data)
+        await broker.publish("VersionShot", version_change(data), updated)
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": "Version shot updated successfully!",
-            "data": jsonable_encoder(updated)
+            "data": updated
         }, status_code=202)
 
     except HTTPException as he:
@@ -139,108 +141,249 @@ async def update_versionshot(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def list_versionshots():
+@router.post("/{versionshot_id}/lock", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def lock_versionshot(
+    request: Request,
+    versionshot_id: str = Path(..., description="ID of the version shot")
+):
+    """
+    Endpoint to lock a version shot for editing.
+    Body: {"edit_user_id", "edit_user_name", "lease_seconds" (optional)}.
+    Succeeds when the version is unlocked, already locked by this user, or its lease expired;
+    otherwise 409. Keep the lock alive with /heartbeat before lock_expires_at.
+    """
+    try:
+        data = await lock_request(request)
+        versionshot = await LockService.lock(
+            versionshot_id, data["edit_user_id"], data.get("edit_user_name"), lease_seconds(data.get("lease_seconds"))
+        )
+        await broker.publish("VersionShot", "locked", versionshot)
+
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Version shot locked successfully!",
+            "data": versionshot
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{versionshot_id}/heartbeat", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def heartbeat_versionshot(
+    request: Request,
+    versionshot_id: str = Path(..., description="ID of the version shot")
+):
+    """
+    Endpoint to extend the lease of a lock held by edit_user_id.
+    Body: {"edit_user_id", "lease_seconds" (optional)}. Returns 409 when the lock was lost.
+    """
+    try:
+        data = await lock_request(request)
+        versionshot = await LockService.heartbeat(versionshot_id, data["edit_user_id"], lease_seconds(data.get("lease_seconds")))
+
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Version shot lock extended successfully!",
+            "data": versionshot
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{versionshot_id}/unlock", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def unlock_versionshot(
+    request: Request,
+    versionshot_id: str = Path(..., description="ID of the version shot")
+):
+    """
+    Endpoint to release the lock of a version shot.
+    Body: {"edit_user_id"}. Returns 409 when another user holds a live lock.
+    """
+    try:
+        data = await lock_request(request)
+        versionshot = await LockService.unlock(versionshot_id, data["edit_user_id"])
+        await broker.publish("VersionShot", "unlocked", versionshot)
+
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Version shot unlocked successfully!",
+            "data": versionshot
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{versionshot_id}/commit", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def commit_versionshot(
+    request: Request,
+    versionshot_id: str = Path(..., description="ID of the version shot")
+):
+    """
+    Endpoint to commit a version shot and release its lock.
+    Body: {"edit_user_id", "edit_user_name"}. Returns 409 when it is already committed
+    or another user holds a live lock.
+    """
+    try:
+        data = await lock_request(request)
+        versionshot = await LockService.commit(versionshot_id, data["edit_user_id"], data.get("edit_user_name"))
+        await broker.publish("VersionShot", "committed", versionshot)
+
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Version shot committed successfully!",
+            "data": versionshot
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/list", response_model=PageResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def list_versionshots(page: PageParams = Depends(), selection: Selection = Depends(version_fields)):
     """
-    Endpoint to list all version shots.
+    Endpoint to list version shots, one page at a time.
+    Pass the returned next_cursor as `cursor` to fetch the following page.
     """
     try:
-        versionshots = await db.versionshot.find_many()
-        return JSONResponse(content={
+        versionshots, next_cursor = await paginate(selection.delegate(reader().versionshot, keyset=True), page, include=selection.include)
+        return FastJSONResponse(content={
             "success": True,
             "message": "Version shots retrieved successfully!",
-            "data": jsonable_encoder(versionshots)
+            "data": versionshots,
+            "next_cursor": next_cursor
         }, status_code=200)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list/{shot_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
-async def get_versionshots_by_shot_id(shot_id: str = Path(..., description="ID of the shot")):
+@router.get("/list/{shot_id}", response_model=PageResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_versionshots_by_shot_id(
+    shot_id: str = Path(..., description="ID of the shot"),
+    page: PageParams = Depends(),
+    selection: Selection = Depends(version_fields)
+):
     """
-    Endpoint to retrieve all version shots by shot_id.
+    Endpoint to retrieve version shots by shot_id, one page at a time.
     """
     try:
-        versionshots = await db.versionshot.find_many(where={"shot_id": shot_id})
-        return JSONResponse(content={
+        versionshots, next_cursor = await paginate(selection.delegate(reader().versionshot, keyset=True), page, where={"shot_id": shot_id}, include=selection.include)
+        return FastJSONResponse(content={
             "success": True,
             "message": "Version shots retrieved successfully!",
-            "data": jsonable_encoder(versionshots)
+            "data": versionshots,
+            "next_cursor": next_cursor
         }, status_code=200)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list/{shot_id}/tasks/{task_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+@router.get("/list/{shot_id}/tasks/{task_id}", response_model=DataResponse[List[VersionShotResponse]], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
 async def get_versionshots_by_shot_id_and_task_id(
+    request: Request,
     shot_id: str = Path(..., description="ID of the shot"),
-    task_id: str = Path(..., description="ID of the task")
+    task_id: str = Path(..., description="ID of the task"),
+    selection: Selection = Depends(version_fields)
 ):
     """
     Endpoint to retrieve all version shots by shot_id and task_id,
     ordered with the latest version on top.
+    Supports If-None-Match / If-Modified-Since, answered with 304 from a single aggregate query.
     """
     try:
-        versionshots = await db.versionshot.find_many(where={
+        validator = None
+        if selection.include is None:
+            validator = await versions_validator(shot_id, task_id, variant=request.url.query)
+            cached = not_modified(request, validator)
+            if cached:
+                return cached
+
+        versionshots = await selection.delegate(reader().versionshot).find_many(where={
             "shot_id": shot_id,
             "task_id": task_id
-        }, order={"version_number": "desc"})
-        return JSONResponse(content={
+        }, order={"version_number": "desc"}, include=selection.include)
+        response = FastJSONResponse(content={
             "success": True,
             "message": "Version shots retrieved successfully!",
-            "data": jsonable_encoder(versionshots)
+            "data": versionshots
         }, status_code=200)
+        return with_validator(response, validator) if validator and validator.exists else response
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list/{shot_id}/tasks/{task_id}/versions", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+@router.get("/list/{shot_id}/tasks/{task_id}/versions", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
 async def get_versionshots_by_shot_id_and_task_id_versions(
+    request: Request,
     shot_id: str = Path(..., description="ID of the shot"),
-    task_id: str = Path(..., description="ID of the task")
+    task_id: str = Path(..., description="ID of the task"),
+    selection: Selection = Depends(version_fields)
 ):
     """
     Endpoint to retrieve the latest version shot by shot_id and task_id.
+    Supports If-None-Match / If-Modified-Since, answered with 304 from a single aggregate query.
     """
     try:
-        versionshots = await db.versionshot.find_first(
+        validator = None
+        if selection.include is None:
+            validator = await versions_validator(shot_id, task_id, variant=request.url.query)
+            cached = not_modified(request, validator)
+            if cached:
+                return cached
+
+        versionshots = await selection.delegate(reader().versionshot).find_first(
             where={
                 "shot_id": shot_id,
                 "task_id": task_id
             },
-            order={"version_number": "desc"}
+            order={"version_number": "desc"},
+            include=selection.include
         )
         if not versionshots:
             raise HTTPException(status_code=404, detail=f"No versions found for shot_id '{shot_id}' and task_id '{task_id}'.")
 
-        return JSONResponse(content={
+        response = FastJSONResponse(content={
             "success": True,
             "message": "Latest version shot retrieved successfully!",
-            "data": jsonable_encoder(versionshots)
+            "data": versionshots
         }, status_code=200)
+        return with_validator(response, validator) if validator else response
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list/{shot_id}/tasks/{task_id}/versions/{version_number}", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+@router.get("/list/{shot_id}/tasks/{task_id}/versions/{version_number}", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
 async def get_version_by_shot_id_and_task_id(
     shot_id: str = Path(..., description="ID of the shot"),
     task_id: str = Path(..., description="ID of the task"),
-    version_number: int = Path(..., description="Version number to retrieve")
+    version_number: int = Path(..., description="Version number to retrieve"),
+    selection: Selection = Depends(version_fields)
 ):
     """
     Endpoint to retrieve a specific version shot by shot_id, task_id, and version_number.
     """
     try:
-        version_shot = await db.versionshot.find_first(where={
+        version_shot = await selection.delegate(reader().versionshot).find_first(where={
             "shot_id": shot_id,
             "task_id": task_id,
             "version_number": version_number
-        })
+        }, include=selection.include)
         if not version_shot:
             raise HTTPException(status_code=404, detail=f"Version {version_number} for shot_id '{shot_id}' and task_id '{task_id}' not found.")
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": f"Version {version_number} retrieved successfully!",
-            "data": jsonable_encoder(version_shot)
+            "data": version_shot
         }, status_code=200)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -254,17 +397,123 @@ async def delete_version_by_shot_id_and_task_id(
     Endpoint to delete a specific version shot by shot_id, task_id, and version_number.
     """
     try:
-        deleted_version = await db.versionshot.delete_many(where={
-            "shot_id": shot_id,
-            "task_id": task_id,
-            "version_number": version_number
+        deleted_version = await db.versionshot.delete(where={
+            "shot_id_task_id_version_number": {
+                "shot_id": shot_id,
+                "task_id": task_id,
+                "version_number": version_number
+            }
         })
-        if deleted_version.count == 0:
+        if not deleted_version:
             raise HTTPException(status_code=404, detail=f"Version {version_number} for shot_id '{shot_id}' and task_id '{task_id}' not found.")
+        await broker.publish("VersionShot", "deleted", deleted_version)
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "message": f"Version {version_number} deleted successfully!"
         }, status_code=204)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/filter", response_model=PageResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def filter_versionshots(
+    filters: VersionFilter = Depends(),
+    page: PageParams = Depends(),
+    selection: Selection = Depends(version_fields)
+):
+    """
+    Endpoint to list version shots filtered by project, episode, sequence, shot, task,
+    lock/commit state and update time, one page at a time.
+    """
+    try:
+        versionshots, next_cursor = await paginate(
+            selection.delegate(reader().versionshot, keyset=True), page, where=filters.where(), include=selection.include
+        )
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Version shots retrieved successfully!",
+            "data": versionshots,
+            "next_cursor": next_cursor
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/export", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def export_versionshots(
+    project_id: Optional[str] = Query(None, description="Only export rows of this project"),
+    since: Optional[datetime] = Query(None, description="Only export rows updated at or after this time")
+):
+    """
+    Endpoint to export every version shot as newline-delimited JSON.
+    Rows are streamed from the database in chunks, so memory stays flat regardless of project size.
+    """
+    return ndjson_response(iter_rows(reader().versionshot, where=export_where(project_id, since)))
+
+@router.get("/retention", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_retention_stats():
+    """
+    Endpoint to retrieve the metrics of the version retention job on this worker:
+    runs, batches, versions pruned, lock timeouts and the report of the last run.
+    """
+    try:
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Retention stats retrieved successfully!",
+            "data": retention.stats()
+        }, status_code=200)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/retention/run", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def run_retention(
+    dry_run: bool = Query(True, description="Only count the versions that would be pruned"),
+    keep: Optional[int] = Query(None, ge=1, description="Uncommitted versions to keep per shot/task (at least RETENTION_KEEP_UNCOMMITTED)")
+):
+    """
+    Endpoint to run one retention pass now and return its report.
+    Defaults to a dry run; real runs are refused with 403 unless RETENTION_MANUAL_RUNS is set.
+    `keep` cannot go below RETENTION_KEEP_UNCOMMITTED, and RETENTION_ALLOWED_HOURS still applies.
+    """
+    try:
+        if not dry_run and not settings.RETENTION_MANUAL_RUNS:
+            raise HTTPException(status_code=403, detail="Manual retention runs are dry-run only; set RETENTION_MANUAL_RUNS to allow deleting.")
+        if keep is not None:
+            keep = max(keep, settings.RETENTION_KEEP_UNCOMMITTED)
+
+        report = await retention.run_once(dry_run=dry_run, keep=keep)
+        return FastJSONResponse(content={
+            "success": "error" not in report,
+            "message": "Another worker is running retention." if report.get("skipped") else f"{report['pruned']} version shots {'would be ' if dry_run else ''}pruned.",
+            "data": report
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{versionshot_id}", response_model=DataResponse[VersionShotResponse], status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+async def get_versionshot(
+    versionshot_id: str = Path(..., description="ID of the version shot"),
+    selection: Selection = Depends(version_fields)
+):
+    """
+    Endpoint to retrieve a specific version shot by its ID.
+    """
+    try:
+        versionshot = await selection.delegate(reader().versionshot).find_first(where={"id": versionshot_id}, include=selection.include)
+        if not versionshot:
+            raise HTTPException(status_code=404, detail=f"Version shot with ID '{versionshot_id}' not found.")
+
+        return FastJSONResponse(content={
+            "success": True,
+            "message": "Version shot retrieved successfully!",
+            "data": versionshot
+        }, status_code=200)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Request
 from fastapi.responses import JSONResponse
 from app.config import settings
+from app.core.token_cache import token_cache
+from app.services.auth import AuthService
 
 router = APIRouter()
 
@@ -21,3 +23,15 @@ def get_zou():
         "message": "Zou API is configured!",
         "url": settings.ZOU_API_URL
     }, status_code=200)
+
+@router.get("/token-cache", status_code=status.HTTP_200_OK, dependencies=[Depends(AuthService.verify_user_token)])
+def get_token_cache_stats():
+    """
+    Hit/miss counters of the validated token cache.
+    Shows how many token checks were answered without calling Zou.
+    """
+    return JSONResponse(content={
+        "success": True,
+        "message": "Token cache stats retrieved successfully!",
+        "data": token_cache.stats()
+    }, status_code=200)
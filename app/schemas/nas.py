@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+class NasServerResponse(BaseModel):
+    id: str
+    name: str
+    host: str
+    protocol: str
+    port: Optional[int] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    project_path: Optional[str] = None
+    drive_letter: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,19 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+# The routers return FastJSONResponse directly, so response_model only documents the API
+# (OpenAPI schema): FastAPI does not validate or filter these responses. A field that must
+# not reach clients has to be left out of the data itself, not just out of a model.
+
+class DataResponse(BaseModel, Generic[T]):
+    success: bool
+    message: str
+    data: Optional[T] = None
+
+class PageResponse(BaseModel, Generic[T]):
+    success: bool
+    message: str
+    data: List[T]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+from app.schemas.nas import NasServerResponse
+
+class VersionShotResponse(BaseModel):
+    id: str
+    file_name: str
+    file_path: str
+    version_number: int
+    commited: bool
+    locked: bool
+    locked_by_user_id: Optional[str] = None
+    locked_by_user_name: Optional[str] = None
+    lock_expires_at: Optional[datetime] = None
+    label: Optional[str] = None
+    notes: Optional[str] = None
+    program: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    edit_user_id: str
+    edit_user_name: str
+    project_id: str
+    project_name: str
+    episode_id: str
+    episode_name: str
+    sequence_id: str
+    sequence_name: str
+    shot_id: str
+    shot_name: str
+    task_id: str
+    task_name: str
+    master_shot_id: str
+    master_shot: Optional["MasterShotResponse"] = None
+
+class MasterShotResponse(BaseModel):
+    id: str
+    file_name: str
+    file_path: str
+    version_folder: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    edit_user_id: str
+    edit_user_name: str
+    project_id: str
+    project_name: str
+    episode_id: str
+    episode_name: str
+    sequence_id: str
+    sequence_name: str
+    shot_id: str
+    shot_name: str
+    task_id: str
+    task_name: str
+    nas_server_id: Optional[str] = None
+    next_version_number: int = 0
+    nas_server: Optional[NasServerResponse] = None
+    latest_version_shot: Optional[VersionShotResponse] = None
+
+VersionShotResponse.model_rebuild()
+
+# Lives here rather than in nas.py to avoid a circular import with the shot models
+class NasServerWithShotsResponse(NasServerResponse):
+    master_shots: Optional[List[MasterShotResponse]] = None
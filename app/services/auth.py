@@ -4,7 +4,9 @@ from fastapi.encoders import jsonable_encoder
 from typing import Optional
 from app.config import settings
 from app.core.prisma import db
-import requests
+from app.core.zou import get_zou_client
+from app.core.token_cache import token_cache
+from app.core.metrics import zou_call
 import httpx
 
 class AuthService:
@@ -19,32 +21,64 @@ class AuthService:
                                 detail="Missing or invalid Authorization header")
 
         token = auth_header.split(" ")[1]
+        return await AuthService.verify_token(token)
 
-        # 2. Validate token with external ZOU API
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.ZOU_API_URL}/auth/authenticated",
+    @staticmethod
+    async def verify_token(token: str):
+        """
+        Validate a bearer token with the ZOU API (cached and coalesced per token) and return the user.
+        """
+        async def fetch_user():
+            with zou_call("AuthService.verify_token"):
+                response = await get_zou_client().get(
+                    "/auth/authenticated",
                     headers={"Authorization": f"Bearer {token}"}
                 )
-                if response.status_code != 200:
-                    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 401:
+                return None
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+        try:
+            user = await token_cache.get_or_fetch(settings.ZOU_API_URL, token, fetch_user)
         except httpx.RequestError as e:
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Auth service error: {str(e)}")
 
-def verify_login_kitsu(email, password, api_url):
-    """Verify user login with Kitsu API"""
-    api_url = f"{api_url}/auth/login"
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+        return user
 
+async def verify_login_kitsu(email, password, api_url):
+    """
+    Verify user login with Kitsu API.
+    Uses the pooled client of that Zou URL with strict login timeouts, and seeds
+    the token cache so the first protected call does not re-validate the new token.
+    """
     headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
     payload = {"email": email, "password": password}
+    timeout = httpx.Timeout(settings.ZOU_LOGIN_TIMEOUT, connect=settings.ZOU_LOGIN_CONNECT_TIMEOUT)
 
     try:
-        response = requests.post(api_url, headers=headers, data=payload)
-        # print(f"JSON: {response.json()}")
+        with zou_call("verify_login_kitsu"):
+            response = await get_zou_client(api_url).post("/auth/login", headers=headers, data=payload, timeout=timeout)
         if response.status_code != 200:
-            return {"success": False, "message": "Login failed. Please check your credentials."}
-        return response.json(), response.cookies
-    except requests.RequestException as e:
-        return {"success": False, "message": f"Network error: {e}"}
+            return {"success": False, "message": "Login failed. Please check your credentials."}, None
+        data = response.json()
+    except httpx.RequestError as e:
+        return {"success": False, "message": f"Network error: {e}"}, None
+    except httpx.InvalidURL as e:
+        return {"success": False, "message": f"Invalid Zou URL: {e}"}, None
+    except ValueError:
+        # Not JSON, e.g. the HTML page of a proxy in front of Zou
+        return {"success": False, "message": "Login failed. Zou returned an unexpected response."}, None
 
+    if isinstance(data, dict) and data.get("access_token") and data.get("user"):
+        # Same shape as Zou's /auth/authenticated answer
+        token_cache.put(api_url, data["access_token"], {
+            "authenticated": True,
+            "user": data["user"],
+            "organisation": data.get("organisation"),
+            "ldap": data.get("ldap", False),
+        })
+    return data, response.cookies
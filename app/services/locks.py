@@ -0,0 +1,165 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.prisma import db
+from app.generated.prisma.models import VersionShot
+
+# Timestamp columns are TIMESTAMP(3) holding UTC, as Prisma writes them: compare and write
+# them against the current UTC time, not now() in the session time zone.
+NOW_UTC_SQL = "(now() AT TIME ZONE 'UTC')"
+
+# The joined master shot as JSON. to_jsonb renders TIMESTAMP(3) without an offset, which
+# the model then reads as naive local time; read the UTC columns as timestamptz instead.
+MASTER_SHOT_JSON_SQL = """to_jsonb(m) || jsonb_build_object(
+    'created_at', m."created_at" AT TIME ZONE 'UTC',
+    'updated_at', m."updated_at" AT TIME ZONE 'UTC'
+)"""
+
+# A lock is free for user $2 when nobody holds it, $2 already holds it, or its lease ran out.
+# Locks taken before leases existed (or set through create) have no lock_expires_at and
+# expire one default lease after the row was last written.
+LOCK_AVAILABLE_SQL = (
+    '("locked" = false OR "locked_by_user_id" = $2 OR '
+    f'COALESCE("lock_expires_at", "updated_at" + make_interval(secs => {float(settings.VERSION_LOCK_LEASE)})) < {NOW_UTC_SQL})'
+)
+
+# Every operation is one conditional UPDATE: when the condition does not hold no row is
+# returned and nothing was written, so two users can never both win the same lock.
+_LOCK_SQL = f"""
+WITH updated AS (
+    UPDATE "VersionShot"
+    SET "locked" = true,
+        "locked_by_user_id" = $2,
+        "locked_by_user_name" = $3,
+        "lock_expires_at" = {NOW_UTC_SQL} + make_interval(secs => $4::float8),
+        "updated_at" = {NOW_UTC_SQL}
+    WHERE "id" = $1 AND "commited" = false AND {LOCK_AVAILABLE_SQL}
+    RETURNING *
+)
+SELECT updated.*, {MASTER_SHOT_JSON_SQL} AS "master_shot"
+FROM updated JOIN "MasterShot" m ON m."id" = updated."master_shot_id"
+"""
+
+# Heartbeats bump updated_at too, so ETag/Last-Modified of polled versions show the new lease
+_HEARTBEAT_SQL = f"""
+UPDATE "VersionShot"
+SET "lock_expires_at" = {NOW_UTC_SQL} + make_interval(secs => $3::float8),
+    "updated_at" = {NOW_UTC_SQL}
+WHERE "id" = $1 AND "commited" = false AND "locked" = true AND "locked_by_user_id" = $2
+RETURNING *
+"""
+
+_UNLOCK_SQL = f"""
+WITH updated AS (
+    UPDATE "VersionShot"
+    SET "locked" = false,
+        "locked_by_user_id" = NULL,
+        "locked_by_user_name" = NULL,
+        "lock_expires_at" = NULL,
+        "updated_at" = {NOW_UTC_SQL}
+    WHERE "id" = $1 AND "commited" = false AND {LOCK_AVAILABLE_SQL}
+    RETURNING *
+)
+SELECT updated.*, {MASTER_SHOT_JSON_SQL} AS "master_shot"
+FROM updated JOIN "MasterShot" m ON m."id" = updated."master_shot_id"
+"""
+
+_COMMIT_SQL = f"""
+WITH updated AS (
+    UPDATE "VersionShot"
+    SET "commited" = true,
+        "locked" = false,
+        "locked_by_user_id" = NULL,
+        "locked_by_user_name" = NULL,
+        "lock_expires_at" = NULL,
+        "edit_user_id" = $2,
+        "edit_user_name" = COALESCE($3, "edit_user_name"),
+        "updated_at" = {NOW_UTC_SQL}
+    WHERE "id" = $1 AND "commited" = false AND {LOCK_AVAILABLE_SQL}
+    RETURNING *
+)
+SELECT updated.*, {MASTER_SHOT_JSON_SQL} AS "master_shot"
+FROM updated JOIN "MasterShot" m ON m."id" = updated."master_shot_id"
+"""
+
+def lease_seconds(requested: Optional[float]) -> float:
+    if requested is None:
+        return settings.VERSION_LOCK_LEASE
+    try:
+        lease = float(requested)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="lease_seconds must be a number")
+    if not 0 < lease <= settings.VERSION_LOCK_LEASE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"lease_seconds must be between 0 and {settings.VERSION_LOCK_LEASE_MAX}"
+        )
+    return lease
+
+class LockService:
+    """Service for locking version shots while a user works on them"""
+
+    @staticmethod
+    async def explain_rejection(
+        versionshot_id: str,
+        user_id: str,
+        committed_status: int = status.HTTP_409_CONFLICT,
+        forbidden_status: int = status.HTTP_409_CONFLICT,
+    ):
+        """
+        Raise the error of a conditional update that matched no row.
+        Only runs on the failure path, so successful operations stay at one round trip.
+        """
+        current = await db.versionshot.find_unique(where={"id": versionshot_id})
+        if not current:
+            raise HTTPException(status_code=404, detail=f"Version shot with ID '{versionshot_id}' not found.")
+        if current.commited:
+            raise HTTPException(status_code=committed_status, detail="Cannot update a committed version shot.")
+        if current.locked and current.locked_by_user_id != user_id:
+            raise HTTPException(
+                status_code=forbidden_status,
+                detail=f"This version shot is locked by another user: {current.locked_by_user_name}"
+            )
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This version shot is not locked by you.")
+
+    @staticmethod
+    async def lock(versionshot_id: str, user_id: str, user_name: Optional[str], lease: float) -> VersionShot:
+        """
+        Take or renew the lock of a version shot for `lease` seconds.
+        """
+        versionshot = await db.query_first(_LOCK_SQL, versionshot_id, user_id, user_name, lease, model=VersionShot)
+        if versionshot is None:
+            await LockService.explain_rejection(versionshot_id, user_id)
+        return versionshot
+
+    @staticmethod
+    async def heartbeat(versionshot_id: str, user_id: str, lease: float) -> VersionShot:
+        """
+        Extend the lease of a lock the user still holds.
+        """
+        versionshot = await db.query_first(_HEARTBEAT_SQL, versionshot_id, user_id, lease, model=VersionShot)
+        if versionshot is None:
+            await LockService.explain_rejection(versionshot_id, user_id)
+        return versionshot
+
+    @staticmethod
+    async def unlock(versionshot_id: str, user_id: str) -> VersionShot:
+        """
+        Release the lock. Unlocking a free or expired lock succeeds.
+        """
+        versionshot = await db.query_first(_UNLOCK_SQL, versionshot_id, user_id, model=VersionShot)
+        if versionshot is None:
+            await LockService.explain_rejection(versionshot_id, user_id)
+        return versionshot
+
+    @staticmethod
+    async def commit(versionshot_id: str, user_id: str, user_name: Optional[str]) -> VersionShot:
+        """
+        Mark the version as committed and release its lock.
+        """
+        versionshot = await db.query_first(_COMMIT_SQL, versionshot_id, user_id, user_name, model=VersionShot)
+        if versionshot is None:
+            await LockService.explain_rejection(versionshot_id, user_id)
+        return versionshot
\ No newline at end of file
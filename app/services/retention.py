@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from app.config import settings
+from app.core.events import broker, listener_dsn
+from app.core.prisma import db
+from app.generated.prisma.errors import RawQueryError
+from app.services.locks import NOW_UTC_SQL
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - asyncpg is only needed to coordinate several workers
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+# Session advisory lock held by the worker that is pruning, so the other workers skip their run
+_ADVISORY_LOCK_KEY = 0x6B69796F72657400
+
+# A lock is live while its lease (or, without one, a default lease after the last write) has not run out
+_LIVE_LOCK_SQL = (
+    '({alias}."locked" AND COALESCE({alias}."lock_expires_at", '
+    f'{{alias}}."updated_at" + make_interval(secs => {float(settings.VERSION_LOCK_LEASE)})) >= {NOW_UTC_SQL})'
+)
+
+# Uncommitted versions of the master shots in ($1, $2] ranked newest first per (shot_id, task_id).
+# Everything past the first $3 is prunable, except versions someone holds a live lock on.
+# The range walks the (master_shot_id, version_number) index, so one batch only reads the
+# versions of a bounded slice of master shots instead of ranking the whole table.
+_PRUNABLE_SQL = f"""
+WITH ranked AS (
+    SELECT v."id", v."locked", v."lock_expires_at", v."updated_at",
+           row_number() OVER (PARTITION BY v."shot_id", v."task_id" ORDER BY v."version_number" DESC) AS "rank"
+    FROM "VersionShot" v
+    WHERE v."master_shot_id" > $1 AND v."master_shot_id" <= $2 AND v."commited" = false
+),
+prunable AS (
+    SELECT "id" FROM ranked
+    WHERE "rank" > $3
+      AND NOT {_LIVE_LOCK_SQL.format(alias="ranked")}
+)
+"""
+
+# SKIP LOCKED: rows being edited right now are left for the next run instead of waited on.
+# The CTEs above read the statement snapshot, so committed and lock state is checked again
+# on the locked rows: a version committed or locked since the snapshot is kept.
+_DELETE_SQL = _PRUNABLE_SQL + f""",
+doomed AS (
+    SELECT v."id" FROM "VersionShot" v JOIN prunable p ON p."id" = v."id"
+    WHERE v."commited" = false AND NOT {_LIVE_LOCK_SQL.format(alias="v")}
+    ORDER BY v."id"
+    LIMIT $4
+    FOR UPDATE OF v SKIP LOCKED
+)
+DELETE FROM "VersionShot" v USING doomed
+WHERE v."id" = doomed."id"
+RETURNING v."id", v."project_id", v."shot_id", v."task_id", v."version_number", v."master_shot_id"
+"""
+
+_COUNT_SQL = _PRUNABLE_SQL + """
+SELECT COUNT(*)::int AS "count" FROM prunable
+"""
+
+_MASTER_RANGE_SQL = """
+SELECT "id" FROM "MasterShot" WHERE "id" > $1 ORDER BY "id" LIMIT $2
+"""
+
+def parse_hours(spec: str) -> Optional[Set[int]]:
+    """
+    Parse "22-6" or "1,2,3" (local hours, end exclusive) into a set of hours.
+    An empty spec means any hour.
+    """
+    if not spec.strip():
+        return None
+    hours: Set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = (int(h) % 24 for h in part.split("-", 1))
+            hour = start
+            while hour != end:
+                hours.add(hour)
+                hour = (hour + 1) % 24
+        elif part:
+            hours.add(int(part) % 24)
+    return hours
+
+def _is_lock_timeout(error: RawQueryError) -> bool:
+    return "55P03" in str(error) or "lock timeout" in str(error).lower()
+
+class RetentionEngine:
+    """
+    Deletes old uncommitted version shots: per (shot_id, task_id) the newest
+    RETENTION_KEEP_UNCOMMITTED uncommitted versions are kept, committed versions
+    are always kept, and so are versions under a live lock.
+
+    A run walks master shots in id order, RETENTION_MASTERS_PER_BATCH at a time,
+    and deletes at most RETENTION_BATCH_SIZE rows per transaction. Each transaction
+    sets lock_timeout and statement_timeout, so pruning gives way to user traffic
+    instead of blocking it, and runs only start inside RETENTION_ALLOWED_HOURS.
+    With several workers, a Postgres advisory lock lets only one of them run at a time.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._running = asyncio.Lock()
+        self.metrics: Dict[str, Any] = {
+            "runs": 0,
+            "batches": 0,
+            "pruned_total": 0,
+            "lock_timeouts": 0,
+            "errors": 0,
+            "last_run": None,
+        }
+
+    def allowed_now(self) -> bool:
+        hours = parse_hours(settings.RETENTION_ALLOWED_HOURS)
+        return hours is None or datetime.now().hour in hours
+
+    async def _prune_range(self, low: str, high: str, keep: int) -> List[dict]:
+        async with db.tx() as transaction:
+            await transaction.execute_raw(f"SET LOCAL lock_timeout = {int(settings.RETENTION_LOCK_TIMEOUT_MS)}")
+            await transaction.execute_raw(f"SET LOCAL statement_timeout = {int(settings.RETENTION_STATEMENT_TIMEOUT_MS)}")
+            return await transaction.query_raw(_DELETE_SQL, low, high, keep, settings.RETENTION_BATCH_SIZE)
+
+    async def _count_range(self, low: str, high: str, keep: int) -> int:
+        rows = await db.query_raw(_COUNT_SQL, low, high, keep)
+        return rows[0]["count"]
+
+    @asynccontextmanager
+    async def _exclusive(self) -> AsyncIterator[bool]:
+        """
+        Hold the retention advisory lock for the duration of a run; yields whether it was taken.
+        Prisma pools its connections, so the session lock lives on a dedicated asyncpg
+        connection and is released when that connection closes.
+        """
+        if asyncpg is None:
+            if settings.WEB_CONCURRENCY > 1:
+                logger.warning("asyncpg is not installed: retention runs are not coordinated across workers")
+            yield True
+            return
+        try:
+            connection = await asyncpg.connect(listener_dsn(settings.DATABASE_URL))
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.error(f"Cannot connect to take the retention advisory lock: {e}")
+            yield False
+            return
+        try:
+            yield await connection.fetchval("SELECT pg_try_advisory_lock($1)", _ADVISORY_LOCK_KEY)
+        finally:
+            await connection.close()
+
+    async def run_once(self, dry_run: Optional[bool] = None, keep: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run one pruning pass. With dry_run, only count what would be deleted.
+        Returns the report of this run, also kept in metrics["last_run"].
+        """
+        dry_run = settings.RETENTION_DRY_RUN if dry_run is None else dry_run
+        keep = settings.RETENTION_KEEP_UNCOMMITTED if keep is None else keep
+        report = {
+            "dry_run": dry_run,
+            "keep": keep,
+            "started_at": datetime.now(timezone.utc),
+            "finished_at": None,
+            "masters_scanned": 0,
+            "pruned": 0,
+            "batches": 0,
+            "lock_timeouts": 0,
+            "completed": False,
+        }
+
+        async with self._running, self._exclusive() as exclusive:
+            if not exclusive:
+                logger.info("Retention run skipped: the advisory lock was not taken")
+                report["skipped"] = True
+                report["finished_at"] = report["started_at"]
+                return report
+
+            self.metrics["runs"] += 1
+            started = time.perf_counter()
+            cursor = ""
+            try:
+                while True:
+                    if not self.allowed_now():
+                        logger.info("Retention run stopped: outside RETENTION_ALLOWED_HOURS")
+                        break
+                    masters = await db.query_raw(_MASTER_RANGE_SQL, cursor, settings.RETENTION_MASTERS_PER_BATCH)
+                    if not masters:
+                        report["completed"] = True
+                        break
+                    low, high = cursor, masters[-1]["id"]
+                    report["masters_scanned"] += len(masters)
+
+                    if dry_run:
+                        report["pruned"] += await self._count_range(low, high, keep)
+                        report["batches"] += 1
+                    else:
+                        # Drain this slice in bounded transactions
+                        while True:
+                            try:
+                                deleted = await self._prune_range(low, high, keep)
+                            except RawQueryError as e:
+                                if not _is_lock_timeout(e):
+                                    raise
+                                report["lock_timeouts"] += 1
+                                self.metrics["lock_timeouts"] += 1
+                                break
+                            report["batches"] += 1
+                            self.metrics["batches"] += 1
+                            report["pruned"] += len(deleted)
+                            self.metrics["pruned_total"] += len(deleted)
+                            await broker.publish_many("VersionShot", "deleted", deleted)
+                            if len(deleted) < settings.RETENTION_BATCH_SIZE:
+                                break
+                            await asyncio.sleep(settings.RETENTION_BATCH_PAUSE)
+
+                    cursor = high
+                    await asyncio.sleep(settings.RETENTION_BATCH_PAUSE)
+            except Exception as e:
+                self.metrics["errors"] += 1
+                report["error"] = str(e)
+                logger.error(f"Retention run failed: {e}")
+            finally:
+                report["finished_at"] = datetime.now(timezone.utc)
+                report["duration_seconds"] = round(time.perf_counter() - started, 3)
+                self.metrics["last_run"] = report
+
+        verb = "would prune" if dry_run else "pruned"
+        logger.info(f"Retention {verb} {report['pruned']} versions across {report['masters_scanned']} master shots")
+        return report
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(settings.RETENTION_INTERVAL)
+            if self.allowed_now() and not self._running.locked():
+                await self.run_once()
+
+    async def start(self):
+        if settings.RETENTION_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.RETENTION_ENABLED,
+            "allowed_now": self.allowed_now(),
+            "running": self._running.locked(),
+            **self.metrics,
+        }
+
+retention = RetentionEngine()
\ No newline at end of file
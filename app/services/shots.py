@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.read_routing import reader
+from app.core.nas_cache import nas_cache
+from app.generated.prisma.models import MasterShot, VersionShot
+
+# Every matching master shot with its latest version, in one statement. The LATERAL
+# subquery picks the top version per master shot from the (master_shot_id, version_number)
+# index instead of one query per shot. NAS servers come from the NAS cache.
+_MASTERSHOTS_WITH_LATEST_SQL = """
+SELECT to_jsonb(m) AS "master_shot", to_jsonb(v) AS "latest_version_shot"
+FROM "MasterShot" m
+LEFT JOIN LATERAL (
+    SELECT * FROM "VersionShot" lv
+    WHERE lv."master_shot_id" = m."id"
+    ORDER BY lv."version_number" DESC
+    LIMIT 1
+) v ON true
+WHERE {where}
+ORDER BY m."episode_name", m."sequence_name", m."shot_name", m."task_name"
+"""
+
+_TIMESTAMP_FIELDS = ("created_at", "updated_at", "lock_expires_at")
+
+def _utc(row: Optional[dict]) -> Optional[dict]:
+    """
+    to_jsonb renders Prisma's UTC timestamps without an offset; add it so these
+    rows serialize the same way as rows read through the Prisma client.
+    """
+    if row is None:
+        return None
+    for field in _TIMESTAMP_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str) and not value.endswith(("Z", "+00:00")):
+            row[field] = value + "+00:00"
+    return row
+
+def pair_key(shot_id: str, task_id: str) -> str:
+    return f"{shot_id}:{task_id}"
+
+class ShotService:
+    """Service for reading master shots together with their versions"""
+
+    @staticmethod
+    async def latest_versions(master_shot_ids: List[str]) -> Dict[str, VersionShot]:
+        """
+        Latest version shot of each master shot, in one query.
+        Master shots without versions are absent from the result.
+        """
+        if not master_shot_ids:
+            return {}
+        placeholders = ", ".join(f"${i + 1}" for i in range(len(master_shot_ids)))
+        rows = await reader().query_raw(
+            f'SELECT DISTINCT ON ("master_shot_id") * FROM "VersionShot" '
+            f'WHERE "master_shot_id" IN ({placeholders}) '
+            f'ORDER BY "master_shot_id", "version_number" DESC',
+            *master_shot_ids,
+            model=VersionShot,
+        )
+        return {row.master_shot_id: row for row in rows}
+
+    @staticmethod
+    async def find_by_pairs(
+        pairs: List[Tuple[str, str]],
+        with_latest_version: bool = False,
+    ) -> Dict[str, Optional[dict]]:
+        """
+        Resolve many (shot_id, task_id) pairs to their master shots with one query
+        against the (shot_id, task_id) unique index, plus one for the latest versions.
+        Returns a map keyed by "shot_id:task_id"; unknown pairs map to None.
+        """
+        if len(pairs) > settings.MASTERSHOT_BATCH_MAX:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"A batch lookup may contain at most {settings.MASTERSHOT_BATCH_MAX} pairs."
+            )
+
+        unique_pairs = list(dict.fromkeys(pairs))
+        result: Dict[str, Optional[dict]] = {pair_key(*pair): None for pair in unique_pairs}
+        if not unique_pairs:
+            return result
+
+        mastershots: List[MasterShot] = await reader().mastershot.find_many(
+            where={"OR": [{"shot_id": shot_id, "task_id": task_id} for shot_id, task_id in unique_pairs]},
+        )
+
+        latest = await ShotService.latest_versions([m.id for m in mastershots]) if with_latest_version else {}
+
+        for entry in await nas_cache.attach(mastershots):
+            if with_latest_version:
+                entry["latest_version_shot"] = latest.get(entry["id"])
+            result[pair_key(entry["shot_id"], entry["task_id"])] = entry
+        return result
+
+    @staticmethod
+    async def mastershots_with_latest(where: str, *params) -> List[dict]:
+        """
+        Master shots matching a SQL condition on alias `m`, each with `nas_server` and
+        `latest_version_shot` attached, in a single query.
+        """
+        rows = await reader().query_raw(_MASTERSHOTS_WITH_LATEST_SQL.format(where=where), *params)
+        mastershots = []
+        for row in rows:
+            mastershot = _utc(row["master_shot"])
+            mastershot["latest_version_shot"] = _utc(row["latest_version_shot"])
+            mastershots.append(mastershot)
+        return await nas_cache.attach(mastershots)
+
+    @staticmethod
+    async def get_with_latest(mastershot_id: str) -> Optional[dict]:
+        rows = await ShotService.mastershots_with_latest('m."id" = $1', mastershot_id)
+        return rows[0] if rows else None
+
+    @staticmethod
+    async def project_tree(project_id: str) -> dict:
+        """
+        Every master shot of a project with its NAS server and latest version,
+        grouped by episode then sequence.
+        """
+        mastershots = await ShotService.mastershots_with_latest('m."project_id" = $1', project_id)
+
+        episodes: Dict[str, dict] = {}
+        for mastershot in mastershots:
+            episode = episodes.setdefault(mastershot["episode_id"], {
+                "episode_id": mastershot["episode_id"],
+                "episode_name": mastershot["episode_name"],
+                "sequences": {},
+            })
+            sequence = episode["sequences"].setdefault(mastershot["sequence_id"], {
+                "sequence_id": mastershot["sequence_id"],
+                "sequence_name": mastershot["sequence_name"],
+                "master_shots": [],
+            })
+            sequence["master_shots"].append(mastershot)
+
+        for episode in episodes.values():
+            episode["sequences"] = list(episode["sequences"].values())
+        return {
+            "project_id": project_id,
+            "master_shot_count": len(mastershots),
+            "episodes": list(episodes.values()),
+        }
@@ -0,0 +1,345 @@
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.prisma import db
+from app.generated.prisma.errors import RawQueryError, UniqueViolationError
+from app.generated.prisma.models import VersionShot
+from app.services.locks import LOCK_AVAILABLE_SQL, MASTER_SHOT_JSON_SQL, LockService
+
+# Columns a client may set when publishing a version; the rest are managed here.
+VERSION_INSERT_COLUMNS: Dict[str, str] = {
+    "file_name": "text",
+    "file_path": "text",
+    "commited": "boolean",
+    "locked": "boolean",
+    "locked_by_user_id": "text",
+    "locked_by_user_name": "text",
+    "label": "text",
+    "notes": "text",
+    "program": "text",
+    "edit_user_id": "text",
+    "edit_user_name": "text",
+    "project_id": "text",
+    "project_name": "text",
+    "episode_id": "text",
+    "episode_name": "text",
+    "sequence_id": "text",
+    "sequence_name": "text",
+    "shot_id": "text",
+    "shot_name": "text",
+    "task_id": "text",
+    "task_name": "text",
+}
+
+# Client columns that are NOT NULL without a default
+VERSION_REQUIRED_COLUMNS = (
+    "file_name", "file_path", "edit_user_id", "edit_user_name",
+    "project_id", "project_name", "episode_id", "episode_name",
+    "sequence_id", "sequence_name", "shot_id", "shot_name", "task_id", "task_name",
+)
+
+_PYTHON_TYPES = {"text": str, "boolean": bool}
+
+# Lock state is only changed through LockService (/lock, /heartbeat, /unlock, /commit), which
+# keeps the lease in step; PATCH may set every other client column.
+LOCK_COLUMNS = ("locked", "locked_by_user_id", "locked_by_user_name")
+VERSION_UPDATE_COLUMNS = tuple(column for column in VERSION_INSERT_COLUMNS if column not in LOCK_COLUMNS)
+
+# Timestamp columns are TIMESTAMP(3) holding UTC, as Prisma writes them, so every statement
+# here uses now() AT TIME ZONE 'UTC' rather than now() in the session time zone.
+
+# Allocates the next number from the MasterShot counter and inserts the version in one
+# statement. The UPDATE takes the master shot row lock, so concurrent publishes to the same
+# (shot_id, task_id) queue on it instead of racing for the same number. GREATEST() keeps the
+# counter ahead of versions created with an explicit version_number or before the counter existed.
+_CREATE_NEXT_VERSION_SQL = """
+WITH counter AS (
+    UPDATE "MasterShot"
+    SET "next_version_number" = GREATEST(
+            "next_version_number",
+            COALESCE((
+                SELECT MAX(v."version_number") + 1 FROM "VersionShot" v
+                WHERE v."shot_id" = $1 AND v."task_id" = $2
+            ), 0)
+        ) + 1,
+        "updated_at" = (now() AT TIME ZONE 'UTC')
+    WHERE "shot_id" = $1 AND "task_id" = $2
+    RETURNING "id", "next_version_number" - 1 AS "version_number"
+),
+inserted AS (
+    INSERT INTO "VersionShot" ("id", {columns}, "version_number", "master_shot_id", "created_at", "updated_at")
+    SELECT gen_random_uuid()::text, {values}, counter."version_number", counter."id",
+           (now() AT TIME ZONE 'UTC'), (now() AT TIME ZONE 'UTC')
+    FROM counter
+    RETURNING *
+)
+SELECT inserted.*, {master_shot} AS "master_shot"
+FROM inserted JOIN "MasterShot" m ON m."id" = inserted."master_shot_id"
+"""
+
+# Batch form of the counter bump: one UPDATE for every (shot_id, task_id) group of a batch,
+# reserving `count` consecutive numbers per group. Rows are locked in id order first so two
+# batches touching the same master shots cannot deadlock.
+_RESERVE_VERSIONS_SQL = """
+WITH g("shot_id", "task_id", "count") AS (VALUES {groups}),
+locked AS (
+    SELECT m."id", g."count" FROM "MasterShot" m
+    JOIN g ON m."shot_id" = g."shot_id" AND m."task_id" = g."task_id"
+    ORDER BY m."id"
+    FOR UPDATE OF m
+)
+UPDATE "MasterShot" m
+SET "next_version_number" = GREATEST(
+        m."next_version_number",
+        COALESCE((
+            SELECT MAX(v."version_number") + 1 FROM "VersionShot" v
+            WHERE v."shot_id" = m."shot_id" AND v."task_id" = m."task_id"
+        ), 0)
+    ) + locked."count",
+    "updated_at" = (now() AT TIME ZONE 'UTC')
+FROM locked
+WHERE m."id" = locked."id"
+RETURNING m."id", m."shot_id", m."task_id", m."next_version_number" - locked."count" AS "first_version"
+"""
+
+# Conditional form of PATCH: the lock check and the write are one statement, so a lock
+# taken by someone else between a read and the update can no longer be overwritten.
+_UPDATE_VERSION_SQL = """
+WITH updated AS (
+    UPDATE "VersionShot"
+    SET {assignments}, "updated_at" = (now() AT TIME ZONE 'UTC')
+    WHERE "id" = $1 AND "commited" = false AND {lock_available}
+    RETURNING *
+)
+SELECT updated.*, {master_shot} AS "master_shot"
+FROM updated JOIN "MasterShot" m ON m."id" = updated."master_shot_id"
+"""
+
+def _is_unique_violation(error: RawQueryError) -> bool:
+    return "23505" in str(error) or "unique constraint" in str(error).lower()
+
+def insert_columns(
+    data: Dict[str, Any], first_param: int, allowed: Sequence[str] = tuple(VERSION_INSERT_COLUMNS)
+) -> Tuple[List[str], List[str], List[Any]]:
+    """
+    Return the quoted columns, typed placeholders and values of a version payload.
+    Keys outside `allowed` are ignored, like the managed id/version/master columns.
+    """
+    columns, placeholders, values = [], [], []
+    for column in allowed:
+        sql_type = VERSION_INSERT_COLUMNS[column]
+        if column in data:
+            columns.append(f'"{column}"')
+            placeholders.append(f"${first_param + len(values)}::{sql_type}")
+            values.append(data[column])
+    return columns, placeholders, values
+
+def payload_error(item: Dict[str, Any]) -> Optional[str]:
+    """
+    Why a version payload cannot be inserted: a required column missing or empty, or a
+    column of the wrong JSON type. None when it is valid.
+    """
+    missing = [column for column in VERSION_REQUIRED_COLUMNS if item.get(column) in (None, "")]
+    if missing:
+        return f"Missing required fields: {', '.join(missing)}"
+    wrong = [
+        column for column, sql_type in VERSION_INSERT_COLUMNS.items()
+        if item.get(column) is not None and not isinstance(item[column], _PYTHON_TYPES[sql_type])
+    ]
+    if wrong:
+        return f"Fields of the wrong type: {', '.join(wrong)}"
+    return None
+
+class VersionService:
+    """Service for publishing version shots"""
+
+    @staticmethod
+    async def create_next_version(data: Dict[str, Any]) -> VersionShot:
+        """
+        Create a version shot with the next version number of its (shot_id, task_id),
+        in a single statement. The version is attached to the master shot of that pair.
+        """
+        columns, placeholders, values = insert_columns(data, first_param=3)
+        query = _CREATE_NEXT_VERSION_SQL.format(
+            columns=", ".join(columns), values=", ".join(placeholders), master_shot=MASTER_SHOT_JSON_SQL
+        )
+        try:
+            versionshot = await db.query_first(query, data["shot_id"], data["task_id"], *values, model=VersionShot)
+        except RawQueryError as e:
+            if _is_unique_violation(e):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="VersionShot with the same file_name and file_path already exists."
+                )
+            raise
+
+        if versionshot is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"MasterShot with shot_id '{data['shot_id']}' and task_id '{data['task_id']}' not found."
+            )
+        return versionshot
+
+    @staticmethod
+    async def create_with_version(data: Dict[str, Any]) -> VersionShot:
+        """
+        Create a version shot with a client-chosen version_number.
+        """
+        try:
+            return await db.versionshot.create(data, include={"master_shot": True})
+        except UniqueViolationError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="VersionShot with the same file_name and file_path, or the same version_number, already exists."
+            )
+
+    @staticmethod
+    async def update(versionshot_id: str, data: Dict[str, Any]) -> VersionShot:
+        """
+        Update a version shot unless it is committed or locked by someone other than
+        data["edit_user_id"], in a single statement. Only VERSION_UPDATE_COLUMNS may be
+        set; any other key is rejected with a 400 instead of being dropped silently.
+        """
+        lock_keys = [key for key in data if key in LOCK_COLUMNS]
+        if lock_keys:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{', '.join(lock_keys)} cannot be set with PATCH; use POST /shots/versionshots/{versionshot_id}/lock, /heartbeat and /unlock."
+            )
+        unknown = [key for key in data if key not in VERSION_UPDATE_COLUMNS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"These fields cannot be updated: {', '.join(unknown)}"
+            )
+
+        columns, placeholders, values = insert_columns(data, first_param=3, allowed=VERSION_UPDATE_COLUMNS)
+        assignments = [f"{column} = {placeholder}" for column, placeholder in zip(columns, placeholders)]
+
+        query = _UPDATE_VERSION_SQL.format(
+            assignments=", ".join(assignments), lock_available=LOCK_AVAILABLE_SQL, master_shot=MASTER_SHOT_JSON_SQL
+        )
+        try:
+            versionshot = await db.query_first(query, versionshot_id, data["edit_user_id"], *values, model=VersionShot)
+        except RawQueryError as e:
+            if _is_unique_violation(e):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="VersionShot with the same file_name and file_path already exists."
+                )
+            raise
+
+        if versionshot is None:
+            await LockService.explain_rejection(
+                versionshot_id, data["edit_user_id"],
+                committed_status=status.HTTP_400_BAD_REQUEST, forbidden_status=status.HTTP_403_FORBIDDEN
+            )
+        return versionshot
+
+    @staticmethod
+    async def create_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Publish many version shots at once.
+
+        Items are validated together, version numbers are reserved for every
+        (shot_id, task_id) group with one UPDATE, and the rows are inserted with
+        create_many, all inside one transaction. Returns one result per item, in order.
+        """
+        if len(items) > settings.VERSION_BATCH_MAX:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"A batch may contain at most {settings.VERSION_BATCH_MAX} versions."
+            )
+
+        results: List[Dict[str, Any]] = [{"index": i, "success": False} for i in range(len(items))]
+
+        def reject(index: int, code: int, message: str):
+            results[index].update({"status": code, "message": message})
+
+        # 1. Validate payloads and duplicates inside the batch
+        seen_names: Dict[str, int] = {}
+        valid: List[int] = []
+        for i, item in enumerate(items):
+            # Every NOT NULL column and type is checked here (file_name is a string before
+            # the duplicate lookup), so create_many below cannot fail on one bad item
+            error = payload_error(item) if isinstance(item, dict) else "Each version must be a JSON object"
+            if error:
+                reject(i, 400, error)
+            elif "version_number" in item:
+                reject(i, 400, "version_number is assigned by the server in batch publishes")
+            elif item["file_name"] in seen_names:
+                reject(i, 409, f"Duplicate file_name of item {seen_names[item['file_name']]} in this batch")
+            else:
+                seen_names[item["file_name"]] = i
+                valid.append(i)
+
+        # 2. Duplicates already in the database, in one query
+        if valid:
+            existing = await db.versionshot.find_many(
+                where={"file_name": {"in": [items[i]["file_name"] for i in valid]}}
+            )
+            taken = {v.file_name for v in existing}
+            for i in [i for i in valid if items[i]["file_name"] in taken]:
+                reject(i, 409, "VersionShot with the same file_name already exists.")
+            valid = [i for i in valid if items[i]["file_name"] not in taken]
+
+        if not valid:
+            return results
+
+        # 3. Reserve numbers per (shot_id, task_id) and insert, atomically
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for i in valid:
+            groups.setdefault((items[i]["shot_id"], items[i]["task_id"]), []).append(i)
+
+        placeholders, params = [], []
+        for (shot_id, task_id), members in groups.items():
+            n = len(params)
+            placeholders.append(f"(${n + 1}::text, ${n + 2}::text, ${n + 3}::int)")
+            params.extend([shot_id, task_id, len(members)])
+
+        try:
+            async with db.tx() as transaction:
+                reserved = await transaction.query_raw(
+                    _RESERVE_VERSIONS_SQL.format(groups=", ".join(placeholders)), *params
+                )
+                counters = {(r["shot_id"], r["task_id"]): r for r in reserved}
+
+                rows = []
+                for key, members in groups.items():
+                    counter = counters.get(key)
+                    if counter is None:
+                        for i in members:
+                            reject(i, 404, f"MasterShot with shot_id '{key[0]}' and task_id '{key[1]}' not found.")
+                        continue
+                    for offset, i in enumerate(members):
+                        row = {column: items[i][column] for column in VERSION_INSERT_COLUMNS if column in items[i]}
+                        row.update({
+                            "id": str(uuid.uuid4()),
+                            "version_number": counter["first_version"] + offset,
+                            "master_shot_id": counter["id"],
+                        })
+                        rows.append((i, row))
+
+                if rows:
+                    await transaction.versionshot.create_many(data=[row for _, row in rows])
+        except UniqueViolationError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A version in this batch was published concurrently with the same file_name; nothing was created."
+            )
+
+        for i, row in rows:
+            results[i].update({
+                "success": True,
+                "status": 201,
+                "id": row["id"],
+                "file_name": row["file_name"],
+                "shot_id": row["shot_id"],
+                "task_id": row["task_id"],
+                "version_number": row["version_number"],
+                "master_shot_id": row["master_shot_id"],
+            })
+        return results
@@ -0,0 +1,52 @@
+"""
+Compare two load test results (see benchmarks/load_test.py) route by route.
+
+Prints throughput and p50/p95/p99 of both runs with the relative change, and
+exits with 1 when a route's p95 regressed by more than --threshold percent.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 20]
+"""
+import argparse
+import json
+import sys
+
+def change(old: float, new: float) -> str:
+    if not old:
+        return "   n/a"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=20.0, help="allowed p95 regression, in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        old = json.load(f)
+    with open(args.candidate) as f:
+        new = json.load(f)
+
+    print(f"baseline {old.get('commit')} vs candidate {new.get('commit')}")
+    print(f"{'route':<62} {'metric':>6} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    regressions = []
+    for label in sorted(set(old["routes"]) | set(new["routes"])):
+        before, after = old["routes"].get(label), new["routes"].get(label)
+        if before is None or after is None:
+            print(f"{label:<62} only in {'candidate' if before is None else 'baseline'}")
+            continue
+        for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            print(f"{label if metric == 'rps' else '':<62} {metric:>6} {before[metric]:>10.1f} {after[metric]:>10.1f} "
+                  f"{change(before[metric], after[metric]):>8}")
+        if before["p95_ms"] and (after["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 > args.threshold:
+            regressions.append(label)
+
+    print(f"{'total':<62} {'rps':>6} {old['total']['rps']:>10.1f} {new['total']['rps']:>10.1f} "
+          f"{change(old['total']['rps'], new['total']['rps']):>8}")
+    if regressions:
+        print(f"p95 regressed more than {args.threshold}% on: {', '.join(regressions)}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark: response compression of list payloads per content encoding and level.
+
+Payloads are list pages rendered the way the API renders them: version shots
+(/shots/versionshots/list) and master shots with their NAS server and latest
+version (/shots/mastershots/list). For each available encoding (gzip always,
+br with `brotli`, zstd with `zstandard`) and level it reports the compressed size,
+ratio, compression CPU time and throughput, and the time to compress and send the
+page over a link of --link-mbps, the number that matters for remote artists.
+
+Usage:
+    python -m benchmarks.compression [--rows 100 1000] [--repeat 20] [--link-mbps 20]
+"""
+import argparse
+import statistics
+import time
+
+from app.core.compression import ENCODERS
+from app.core.responses import dumps, to_dict
+from benchmarks.serialization import build_rows, envelope
+
+LEVELS = {
+    "gzip": (1, 3, 5, 6, 9),
+    "br": (1, 4, 5, 6, 9, 11),
+    "zstd": (1, 3, 6, 9, 19),
+}
+
+def master_rows(versions):
+    """
+    Master shot list rows: one per shot, with the NAS server and latest version attached.
+    """
+    nas_server = {
+        "id": "nas-1", "name": "studio-nas-01", "host": "10.0.20.11", "protocol": "smb", "port": 445,
+        "username": None, "password": None, "project_path": "/mnt/projects/feature_film", "drive_letter": "P",
+        "created_at": versions[0].created_at, "updated_at": versions[0].updated_at,
+    }
+    rows = {}
+    for version in versions:
+        row = rows.get(version.master_shot_id)
+        if row is None:
+            row = rows[version.master_shot_id] = {
+                **to_dict(version),
+                "id": version.master_shot_id,
+                "file_name": version.file_name.rsplit("_v", 1)[0] + ".blend",
+                "file_path": version.file_path.rsplit("/", 1)[0],
+                "version_folder": version.file_path,
+                "nas_server_id": nas_server["id"],
+                "nas_server": nas_server,
+            }
+            for field in ("version_number", "commited", "locked", "label", "notes", "master_shot_id"):
+                row.pop(field, None)
+        row["latest_version_shot"] = to_dict(version)
+    return list(rows.values())
+
+def measure(body: bytes, encoding: str, level: int, repeat: int):
+    encoder = ENCODERS[encoding]
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = encoder(body, level)
+        samples.append(time.perf_counter() - start)
+    return len(compressed), statistics.median(samples)
+
+def report(name: str, body: bytes, repeat: int, link_mbps: float):
+    bytes_per_second = link_mbps * 1_000_000 / 8
+    print(f"\n{name}: {len(body)} bytes uncompressed, {len(body) / bytes_per_second * 1000:.0f} ms over {link_mbps:g} Mbit/s")
+    print(f"{'encoding':<10}{'level':>6}{'bytes':>10}{'ratio':>8}{'cpu ms':>10}{'MB/s':>9}{'total ms':>10}")
+    for encoding, levels in LEVELS.items():
+        if encoding not in ENCODERS:
+            print(f"{encoding:<10}{'not installed':>24}")
+            continue
+        for level in levels:
+            size, seconds = measure(body, encoding, level, repeat)
+            total = (seconds + size / bytes_per_second) * 1000
+            print(
+                f"{encoding:<10}{level:>6}{size:>10}{len(body) / size:>7.1f}x{seconds * 1000:>10.2f}"
+                f"{len(body) / seconds / 1_000_000:>9.0f}{total:>10.1f}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000], help="page sizes to measure")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--link-mbps", type=float, default=20.0, help="client link speed, e.g. a VPN")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        versions = build_rows(rows)
+        report(f"versionshots/list, {rows} rows", dumps(envelope(versions)), args.repeat, args.link_mbps)
+        masters = master_rows(build_rows(rows * 20))[:rows]
+        report(f"mastershots/list, {len(masters)} rows", dumps(envelope(masters)), args.repeat, args.link_mbps)
+
+if __name__ == "__main__":
+    main()
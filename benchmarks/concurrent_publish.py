@@ -0,0 +1,76 @@
+"""
+Concurrency check: fire N parallel version publishes at one (shot_id, task_id).
+
+Every request must return 201 and the version numbers must be unique and contiguous.
+Runs against a live server (and its database), creating a throw-away master shot first.
+
+Usage:
+    python -m benchmarks.concurrent_publish --base-url http://127.0.0.1:8741 --token <bearer> [-n 50]
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+
+import httpx
+
+def hierarchy(run_id: str) -> dict:
+    return {
+        "edit_user_id": "bench-user",
+        "edit_user_name": "Bench User",
+        "project_id": f"bench-project-{run_id}",
+        "project_name": "Bench Project",
+        "episode_id": "bench-episode",
+        "episode_name": "EP01",
+        "sequence_id": "bench-sequence",
+        "sequence_name": "SQ010",
+        "shot_id": f"bench-shot-{run_id}",
+        "shot_name": "SH0010",
+        "task_id": f"bench-task-{run_id}",
+        "task_name": "Animation",
+    }
+
+async def publish(client: httpx.AsyncClient, base: dict, master_shot_id: str, index: int) -> httpx.Response:
+    return await client.post("/api/v1/shots/versionshots/create", json={
+        **base,
+        "file_name": f"{base['shot_id']}_v{index:04d}.blend",
+        "file_path": f"/bench/{base['shot_id']}/versions",
+        "master_shot_id": master_shot_id,
+    })
+
+async def run(base_url: str, token: str, count: int) -> bool:
+    run_id = uuid.uuid4().hex[:8]
+    base = hierarchy(run_id)
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=count)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        master = await client.post("/api/v1/shots/mastershots/create", json={
+            **base,
+            "file_name": f"{base['shot_id']}_master.blend",
+            "file_path": f"/bench/{base['shot_id']}",
+        })
+        master.raise_for_status()
+        master_shot_id = master.json()["data"]["id"]
+
+        responses = await asyncio.gather(*(publish(client, base, master_shot_id, i) for i in range(count)))
+
+    failures = [r for r in responses if r.status_code != 201]
+    numbers = sorted(r.json()["data"]["version_number"] for r in responses if r.status_code == 201)
+    print(f"publishes: {count}, created: {len(numbers)}, failed: {len(failures)}")
+    for r in failures[:5]:
+        print(f"  {r.status_code}: {r.text[:200]}")
+
+    ok = not failures and numbers == list(range(count))
+    print("version numbers contiguous and unique" if ok else f"unexpected version numbers: {numbers}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8741")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("-n", "--count", type=int, default=50)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.base_url, args.token, args.count)) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Local stand-in for the Zou API used by the load tests.
+
+Answers POST /auth/login and GET /auth/authenticated like Zou does, after a
+configurable latency, and accepts any bearer token except "invalid".
+
+Usage:
+    python -m benchmarks.fake_zou [--port 5099 --latency-ms 20 --jitter-ms 5]
+"""
+import argparse
+import asyncio
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+USER = {
+    "id": "bench-user",
+    "full_name": "Bench User",
+    "email": "bench@example.com",
+    "role": "admin",
+}
+
+def create_app(latency_ms: float = 20.0, jitter_ms: float = 0.0) -> FastAPI:
+    app = FastAPI()
+    app.state.calls = {"login": 0, "authenticated": 0}
+
+    async def delay():
+        await asyncio.sleep(max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+
+    @app.post("/auth/login")
+    async def login(request: Request):
+        app.state.calls["login"] += 1
+        await delay()
+        form = await request.form()
+        if not form.get("email") or not form.get("password"):
+            return JSONResponse({"login": False}, status_code=400)
+        return {
+            "login": True,
+            "user": USER,
+            "organisation": {"name": "Bench"},
+            "ldap": False,
+            "access_token": f"bench-{random.getrandbits(64):016x}",
+            "refresh_token": "bench-refresh",
+        }
+
+    @app.get("/auth/authenticated")
+    async def authenticated(request: Request):
+        app.state.calls["authenticated"] += 1
+        await delay()
+        auth = request.headers.get("Authorization", "")
+        if not auth.startswith("Bearer ") or auth == "Bearer invalid":
+            return JSONResponse({"error": True}, status_code=401)
+        return {"authenticated": True, "user": USER, "organisation": {"name": "Bench"}, "ldap": False}
+
+    @app.get("/stats")
+    async def stats():
+        return app.state.calls
+
+    return app
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms, args.jitter_ms), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Load test: seed a synthetic production, start the fake Zou and the API, drive a
+mix of realistic requests and write throughput and p50/p95/p99 per route as JSON.
+
+Scenarios (weights set with --mix):
+    publish      POST a new version of a random shot/task
+    poll         GET the latest version of a shot/task with If-None-Match, like the DCC plugins
+    list         GET a filtered, paginated page of master shots
+    lock_update  lock the latest version, PATCH it, unlock it
+
+Usage (DATABASE_URL must point at a disposable database with the migrations applied):
+    python -m benchmarks.load_test [--users 50 --duration 30 --warmup 5 --zou-latency-ms 20]
+        [--mix publish=1,poll=6,list=2,lock_update=1] [--output benchmarks/results/run.json]
+        [--base-url http://127.0.0.1:8741  (use an already running server instead of starting one)]
+
+Compare two runs with `python -m benchmarks.compare old.json new.json`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.core.prisma import connect_db, disconnect_db
+from benchmarks.seed import add_arguments, cleanup, seed
+
+PREFIX = "bench-load"
+API = "/api/v1/shots"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds run before measuring")
+    parser.add_argument("--mix", default="publish=1,poll=6,list=2,lock_update=1")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the request mix")
+    parser.add_argument("--zou-port", type=int, default=5099)
+    parser.add_argument("--zou-latency-ms", type=float, default=20.0)
+    parser.add_argument("--zou-jitter-ms", type=float, default=5.0)
+    parser.add_argument("--app-port", type=int, default=8799)
+    parser.add_argument("--base-url", default=None, help="target an already running API; it must use the fake Zou")
+    parser.add_argument("--output", default=None, help="JSON result path (default benchmarks/results/load-<commit>-<time>.json)")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+    add_arguments(parser, projects=2, episodes=3, sequences=4, shots=20, tasks=3, versions=5)
+    return parser.parse_args()
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}', expected one of {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class Recorder:
+    """
+    Latency and status of every request, by route label. Requests finishing
+    before `measure_from` (the warmup) are dropped.
+    """
+
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.samples: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    async def call(self, label: str, request) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await request
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        end = time.perf_counter()
+        if start >= self.measure_from:
+            self.samples.setdefault(label, []).append(end - start)
+            counts = self.statuses.setdefault(label, {})
+            counts[status] = counts.get(status, 0) + 1
+        return response
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def summarize(recorder: Recorder, duration: float) -> Dict[str, dict]:
+    routes = {}
+    for label, samples in sorted(recorder.samples.items()):
+        values = sorted(samples)
+        statuses = recorder.statuses[label]
+        errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 500)
+        routes[label] = {
+            "count": len(values),
+            "rps": round(len(values) / duration, 2),
+            "errors": errors,
+            "statuses": statuses,
+            "mean_ms": round(sum(values) / len(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+    return routes
+
+# --- scenarios -------------------------------------------------------------------------
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, masters: List[dict], versions: List[dict], rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.masters = masters
+        # Latest version of every master shot: the ones artists lock and edit
+        latest = {}
+        for version in versions:
+            if version["version_number"] >= latest.get(version["master_shot_id"], {}).get("version_number", -1):
+                latest[version["master_shot_id"]] = version
+        self.editable = list(latest.values())
+        self.rng = rng
+        self.etags: Dict[str, str] = {}
+
+    async def publish(self, user: int):
+        master = self.rng.choice(self.masters)
+        body = {key: master[key] for key in master if key.endswith(("_id", "_name")) and key != "id"}
+        body.update({
+            "file_name": f"{master['shot_id']}_load_{uuid.uuid4().hex}.blend",
+            "file_path": f"{master['file_path']}/versions",
+            "edit_user_id": f"load-user-{user}",
+        })
+        await self.recorder.call("POST /versionshots/create", self.client.post(f"{API}/versionshots/create", json=body))
+
+    async def poll(self, user: int):
+        master = self.rng.choice(self.masters)
+        url = f"{API}/versionshots/list/{master['shot_id']}/tasks/{master['task_id']}/versions"
+        headers = {"If-None-Match": self.etags[url]} if url in self.etags else {}
+        response = await self.recorder.call("GET /versionshots/list/{shot_id}/tasks/{task_id}/versions", self.client.get(url, headers=headers))
+        if response is not None and response.headers.get("ETag"):
+            self.etags[url] = response.headers["ETag"]
+
+    async def list(self, user: int):
+        master = self.rng.choice(self.masters)
+        params = {"project_id": master["project_id"], "episode_id": master["episode_id"], "limit": 100}
+        await self.recorder.call("GET /mastershots/filter", self.client.get(f"{API}/mastershots/filter", params=params))
+
+    async def lock_update(self, user: int):
+        version = self.rng.choice(self.editable)
+        body = {"edit_user_id": f"load-user-{user}", "edit_user_name": f"Load User {user}"}
+        base = f"{API}/versionshots/{version['id']}"
+        locked = await self.recorder.call("POST /versionshots/{id}/lock", self.client.post(f"{base}/lock", json=body))
+        if locked is None or locked.status_code != 200:
+            return
+        await self.recorder.call("PATCH /versionshots/{id}", self.client.patch(base, json={**body, "notes": f"load test {time.time()}"}))
+        await self.recorder.call("POST /versionshots/{id}/unlock", self.client.post(f"{base}/unlock", json=body))
+
+SCENARIOS = ("publish", "poll", "list", "lock_update")
+
+async def virtual_user(workload: Workload, user: int, mix: Dict[str, float], deadline: float):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        scenario = workload.rng.choices(names, weights)[0]
+        await getattr(workload, scenario)(user)
+
+# --- processes -------------------------------------------------------------------------
+
+def start_process(args: List[str], env: Optional[dict] = None) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], env={**os.environ, **(env or {})})
+
+async def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit(f"{url} did not come up within {timeout}s")
+
+async def login(base_url: str, zou_url: str) -> str:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post("/api/v1/auth/login", json={
+            "username": "bench@example.com", "password": "bench", "zou_url": zou_url,
+        })
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+async def run(args) -> dict:
+    mix = parse_mix(args.mix)
+    started_at = datetime.now(timezone.utc).isoformat()
+    zou_url = f"http://127.0.0.1:{args.zou_port}"
+    base_url = args.base_url or f"http://127.0.0.1:{args.app_port}"
+
+    await connect_db()
+    await cleanup(PREFIX)
+    masters, versions = await seed(args, PREFIX)
+    await disconnect_db()
+
+    processes = [start_process([
+        "-m", "benchmarks.fake_zou", "--port", str(args.zou_port),
+        "--latency-ms", str(args.zou_latency_ms), "--jitter-ms", str(args.zou_jitter_ms),
+    ])]
+    try:
+        if not args.base_url:
+            processes.append(start_process(
+                ["-m", "uvicorn", "app.main:app", "--port", str(args.app_port), "--log-level", "warning"],
+                env={"ZOU_API_URL": zou_url},
+            ))
+        await wait_until_up(f"{zou_url}/stats")
+        await wait_until_up(f"{base_url}/")
+        token = await login(base_url, zou_url)
+
+        start = time.perf_counter()
+        recorder = Recorder(measure_from=start + args.warmup)
+        deadline = start + args.warmup + args.duration
+        limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+        headers = {"Authorization": f"Bearer {token}"}
+        async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+            workload = Workload(client, recorder, masters, versions, random.Random(args.seed))
+            await asyncio.gather(*(virtual_user(workload, user, mix, deadline) for user in range(args.users)))
+        measured = time.perf_counter() - recorder.measure_from
+
+        async with httpx.AsyncClient() as client:
+            zou_calls = (await client.get(f"{zou_url}/stats")).json()
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=15)
+        if not args.keep:
+            await connect_db()
+            await cleanup(PREFIX)
+            await disconnect_db()
+
+    routes = summarize(recorder, measured)
+    total = sum(route["count"] for route in routes.values())
+    return {
+        "commit": git_commit(),
+        "started_at": started_at,
+        "python": platform.python_version(),
+        "config": {
+            "users": args.users, "duration": args.duration, "warmup": args.warmup, "mix": mix, "seed": args.seed,
+            "zou_latency_ms": args.zou_latency_ms, "zou_jitter_ms": args.zou_jitter_ms,
+            "masters": len(masters), "versions": len(versions), "external_server": bool(args.base_url),
+        },
+        "total": {
+            "count": total,
+            "rps": round(total / measured, 2),
+            "errors": sum(route["errors"] for route in routes.values()),
+        },
+        "zou_calls": zou_calls,
+        "routes": routes,
+    }
+
+def print_report(result: dict):
+    print(f"\n{'route':<62} {'count':>7} {'rps':>8} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, route in result["routes"].items():
+        print(f"{label:<62} {route['count']:>7} {route['rps']:>8.1f} {route['errors']:>5} "
+              f"{route['p50_ms']:>8.1f} {route['p95_ms']:>8.1f} {route['p99_ms']:>8.1f}")
+    total = result["total"]
+    print(f"{'total':<62} {total['count']:>7} {total['rps']:>8.1f} {total['errors']:>5}")
+    print(f"zou calls: {result['zou_calls']}")
+
+def main():
+    args = parse_args()
+    result = asyncio.run(run(args))
+    print_report(result)
+
+    output = Path(args.output or f"benchmarks/results/load-{result['commit'] or 'unknown'}-{int(time.time())}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"results written to {output}")
+    sys.exit(1 if result["total"]["errors"] else 0)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
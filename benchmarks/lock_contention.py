@@ -0,0 +1,97 @@
+"""
+Contention check: N users race for the lock of one version shot.
+
+Every round exactly one locker must win (200) and every other must get 409.
+The winner then heartbeats and unlocks, and the next round starts. A last round
+checks lease expiry: a lock taken with a short lease must be free once it runs out.
+Runs against a live server (and its database), creating a throw-away master and version first.
+
+Usage:
+    python -m benchmarks.lock_contention --base-url http://127.0.0.1:8741 --token <bearer> [-n 50 --rounds 5]
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks.concurrent_publish import hierarchy, publish
+
+async def lock(client: httpx.AsyncClient, version_id: str, user: int, lease: float = None) -> httpx.Response:
+    body = {"edit_user_id": f"bench-user-{user}", "edit_user_name": f"Bench User {user}"}
+    if lease is not None:
+        body["lease_seconds"] = lease
+    return await client.post(f"/api/v1/shots/versionshots/{version_id}/lock", json=body)
+
+async def contend(client: httpx.AsyncClient, version_id: str, count: int) -> bool:
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(lock(client, version_id, user) for user in range(count)))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    winners = [user for user, r in enumerate(responses) if r.status_code == 200]
+    conflicts = sum(1 for r in responses if r.status_code == 409)
+    others = [r for r in responses if r.status_code not in (200, 409)]
+    print(f"  lockers: {count}, won: {len(winners)}, 409: {conflicts}, other: {len(others)}, {elapsed:.0f} ms")
+    for r in others[:5]:
+        print(f"    {r.status_code}: {r.text[:200]}")
+    if len(winners) != 1 or others:
+        return False
+
+    winner = {"edit_user_id": f"bench-user-{winners[0]}"}
+    beat = await client.post(f"/api/v1/shots/versionshots/{version_id}/heartbeat", json=winner)
+    loser = await client.post(f"/api/v1/shots/versionshots/{version_id}/heartbeat", json={"edit_user_id": "bench-user-nobody"})
+    unlock = await client.post(f"/api/v1/shots/versionshots/{version_id}/unlock", json=winner)
+    ok = beat.status_code == 200 and loser.status_code == 409 and unlock.status_code == 200
+    if not ok:
+        print(f"    heartbeat {beat.status_code}, foreign heartbeat {loser.status_code}, unlock {unlock.status_code}")
+    return ok
+
+async def expiry(client: httpx.AsyncClient, version_id: str, lease: float) -> bool:
+    first = await lock(client, version_id, 0, lease=lease)
+    blocked = await lock(client, version_id, 1)
+    await asyncio.sleep(lease + 0.5)
+    taken = await lock(client, version_id, 1)
+    ok = first.status_code == 200 and blocked.status_code == 409 and taken.status_code == 200
+    print(f"  lease {lease}s: first {first.status_code}, before expiry {blocked.status_code}, after expiry {taken.status_code}")
+    return ok
+
+async def run(base_url: str, token: str, count: int, rounds: int, lease: float) -> bool:
+    run_id = uuid.uuid4().hex[:8]
+    base = hierarchy(run_id)
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=count)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        master = await client.post("/api/v1/shots/mastershots/create", json={
+            **base,
+            "file_name": f"{base['shot_id']}_master.blend",
+            "file_path": f"/bench/{base['shot_id']}",
+        })
+        master.raise_for_status()
+        version = await publish(client, base, master.json()["data"]["id"], 0)
+        version.raise_for_status()
+        version_id = version.json()["data"]["id"]
+
+        ok = True
+        for i in range(rounds):
+            print(f"round {i + 1}/{rounds}")
+            ok = await contend(client, version_id, count) and ok
+        print("lease expiry")
+        ok = await expiry(client, version_id, lease) and ok
+
+    print("exactly one winner per round, leases expire" if ok else "lock contention check FAILED")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8741")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("-n", "--count", type=int, default=50, help="concurrent lockers per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--lease", type=float, default=2.0, help="lease used by the expiry round, in seconds")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.base_url, args.token, args.count, args.rounds, args.lease)) else 1)
+
+if __name__ == "__main__":
+    main()
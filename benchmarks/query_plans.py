@@ -0,0 +1,94 @@
+"""
+Seed a synthetic production and show that the filter queries use the secondary indexes.
+
+Seeds projects -> episodes -> sequences -> shots -> tasks with N versions each,
+runs ANALYZE, then prints the EXPLAIN plan of every filter the API issues and
+fails if a large table is read with a sequential scan.
+
+Usage (DATABASE_URL must point at a disposable database with the migrations applied):
+    python -m benchmarks.query_plans [--projects 4 --episodes 4 --sequences 5 --shots 25 --tasks 3 --versions 5] [--keep]
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.prisma import db, connect_db, disconnect_db
+from benchmarks.seed import add_arguments, cleanup, seed
+
+PREFIX = "bench-plan"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+    return parser.parse_args()
+
+# (label, SQL equivalent to what the endpoint sends, params)
+QUERIES = [
+    ("mastershots/filter project+episode+sequence",
+     'SELECT * FROM "MasterShot" WHERE "project_id" = $1 AND "episode_id" = $2 AND "sequence_id" = $3 '
+     'ORDER BY "created_at", "id" LIMIT 101',
+     [f"{PREFIX}-p1", f"{PREFIX}-p1-e1", f"{PREFIX}-p1-e1-q1"]),
+    ("mastershots/filter project+updated_after",
+     'SELECT * FROM "MasterShot" WHERE "project_id" = $1 AND "updated_at" >= now() - interval \'1 hour\' '
+     'ORDER BY "created_at", "id" LIMIT 101',
+     [f"{PREFIX}-p1"]),
+    ("mastershots/filter task",
+     'SELECT * FROM "MasterShot" WHERE "task_id" = $1 ORDER BY "created_at", "id" LIMIT 101',
+     [f"{PREFIX}-task1"]),
+    ("versionshots/filter project+episode+sequence",
+     'SELECT * FROM "VersionShot" WHERE "project_id" = $1 AND "episode_id" = $2 AND "sequence_id" = $3 '
+     'ORDER BY "created_at", "id" LIMIT 101',
+     [f"{PREFIX}-p1", f"{PREFIX}-p1-e1", f"{PREFIX}-p1-e1-q1"]),
+    ("versionshots/filter project+updated_after",
+     'SELECT * FROM "VersionShot" WHERE "project_id" = $1 AND "updated_at" >= now() - interval \'2 hours\' '
+     'ORDER BY "created_at", "id" LIMIT 101',
+     [f"{PREFIX}-p1"]),
+    ("versionshots/filter project+locked",
+     'SELECT * FROM "VersionShot" WHERE "project_id" = $1 AND "locked" = true AND "commited" = false '
+     'ORDER BY "created_at", "id" LIMIT 101',
+     [f"{PREFIX}-p1"]),
+    ("versionshots/list/{shot_id}",
+     'SELECT * FROM "VersionShot" WHERE "shot_id" = $1 ORDER BY "created_at", "id" LIMIT 101',
+     [f"{PREFIX}-p1-e1-q1-s1"]),
+    ("mastershots dashboard latest version per shot",
+     'SELECT m."id", v."id" FROM "MasterShot" m LEFT JOIN LATERAL ('
+     'SELECT * FROM "VersionShot" lv WHERE lv."master_shot_id" = m."id" ORDER BY lv."version_number" DESC LIMIT 1'
+     ') v ON true WHERE m."project_id" = $1',
+     [f"{PREFIX}-p1"]),
+]
+
+def walk(node, found):
+    found.append((node.get("Node Type"), node.get("Relation Name"), node.get("Index Name")))
+    for child in node.get("Plans", []):
+        walk(child, found)
+    return found
+
+async def explain():
+    ok = True
+    for label, sql, params in QUERIES:
+        rows = await db.query_raw(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", *params)
+        plan = rows[0]["QUERY PLAN"][0]
+        nodes = walk(plan["Plan"], [])
+        indexes = sorted({index for _, _, index in nodes if index})
+        seq_scans = sorted({relation for node_type, relation, _ in nodes if node_type == "Seq Scan"})
+        status = "ok" if not seq_scans else "SEQ SCAN"
+        ok = ok and not seq_scans
+        print(f"[{status:>8}] {label:<48} {plan['Execution Time']:>8.2f} ms  indexes: {', '.join(indexes) or '-'}")
+    return ok
+
+async def main():
+    args = parse_args()
+    await connect_db()
+    try:
+        await cleanup(PREFIX)
+        await seed(args, PREFIX)
+        ok = await explain()
+        if not args.keep:
+            await cleanup(PREFIX)
+    finally:
+        await disconnect_db()
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Read-your-writes check for DATABASE_READ_URL: publish a version, then read it back at once.
+
+Each publish is read back three ways:
+    plain    no cookie and no header: routed to the replica, may miss the new version
+    header   X-Read-Primary-Until from the publish response sent back: must find it
+    cookie   the cookie set by the publish (httpx keeps it): must find it
+Stale plain reads show the replica lag; any stale header or cookie read is a failure.
+
+Runs against a live server started with a replica, e.g. two local Postgres instances:
+    pg_basebackup -h localhost -p 5432 -D replica -R   # standby of the primary
+    echo "port = 5433" >> replica/postgresql.conf
+    echo "recovery_min_apply_delay = '500ms'" >> replica/postgresql.conf   # simulated lag
+    pg_ctl -D replica start
+    DATABASE_READ_URL=postgresql://.../kiyokai?port=5433 python run.py
+
+Usage:
+    python -m benchmarks.read_your_writes --base-url http://127.0.0.1:8741 --token <bearer> [-n 20]
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+
+import httpx
+
+from benchmarks.concurrent_publish import hierarchy, publish
+
+async def read_back(client: httpx.AsyncClient, version_id: str, mode: str, until: str) -> bool:
+    headers = {}
+    if mode == "header":
+        headers["X-Read-Primary-Until"] = until
+    if mode != "cookie":
+        client.cookies.clear()
+    response = await client.get(f"/api/v1/shots/versionshots/{version_id}", headers=headers)
+    return response.status_code == 200
+
+async def run(base_url: str, token: str, count: int) -> bool:
+    run_id = uuid.uuid4().hex[:8]
+    base = hierarchy(run_id)
+    headers = {"Authorization": f"Bearer {token}"}
+    modes = ("plain", "header", "cookie")
+    stale = {mode: 0 for mode in modes}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=60) as client:
+        master = await client.post("/api/v1/shots/mastershots/create", json={
+            **base,
+            "file_name": f"{base['shot_id']}_master.blend",
+            "file_path": f"/bench/{base['shot_id']}",
+        })
+        master.raise_for_status()
+        master_shot_id = master.json()["data"]["id"]
+
+        index = 0
+        for _ in range(count):
+            for mode in modes:
+                version = await publish(client, base, master_shot_id, index)
+                index += 1
+                version.raise_for_status()
+                until = version.headers.get("x-read-primary-until")
+                if until is None:
+                    print("publish response has no X-Read-Primary-Until: is DATABASE_READ_URL set?")
+                    return False
+                if not await read_back(client, version.json()["data"]["id"], mode, until):
+                    stale[mode] += 1
+
+    for mode in modes:
+        print(f"  {mode:7s} stale reads: {stale[mode]}/{count}")
+    ok = stale["header"] == 0 and stale["cookie"] == 0
+    print("writes are readable right after publishing" if ok else "read-your-writes check FAILED")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8741")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("-n", "--count", type=int, default=20, help="publishes per read mode")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.base_url, args.token, args.count)) else 1)
+
+if __name__ == "__main__":
+    main()
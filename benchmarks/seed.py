@@ -0,0 +1,98 @@
+"""
+Synthetic production seeder shared by the benchmarks.
+
+Builds projects -> episodes -> sequences -> shots -> tasks, one master shot per
+(shot, task) with N versions each, and bulk-inserts them with create_many.
+Every id and project id starts with a prefix so a run can clean up after itself.
+
+Usage (DATABASE_URL must point at a disposable database with the migrations applied):
+    python -m benchmarks.seed --prefix bench [--projects 2 --episodes 2 --sequences 3 --shots 10 --tasks 3 --versions 5] [--cleanup]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from app.core.prisma import db, connect_db, disconnect_db
+
+def add_arguments(parser: argparse.ArgumentParser, projects=4, episodes=4, sequences=5, shots=25, tasks=3, versions=5):
+    parser.add_argument("--projects", type=int, default=projects)
+    parser.add_argument("--episodes", type=int, default=episodes)
+    parser.add_argument("--sequences", type=int, default=sequences)
+    parser.add_argument("--shots", type=int, default=shots)
+    parser.add_argument("--tasks", type=int, default=tasks)
+    parser.add_argument("--versions", type=int, default=versions)
+    parser.add_argument("--chunk", type=int, default=5000, help="rows per create_many")
+
+def build(args, prefix: str) -> Tuple[List[dict], List[dict]]:
+    """
+    Rows of the synthetic production: (master shots, version shots).
+    The newest version of every tenth shot is locked and uncommitted.
+    """
+    now = datetime.now(timezone.utc)
+    masters, versions = [], []
+    for p in range(args.projects):
+        for e in range(args.episodes):
+            for q in range(args.sequences):
+                for s in range(args.shots):
+                    for t in range(args.tasks):
+                        names = {
+                            "edit_user_id": "bench-user", "edit_user_name": "Bench User",
+                            "project_id": f"{prefix}-p{p}", "project_name": f"Project {p}",
+                            "episode_id": f"{prefix}-p{p}-e{e}", "episode_name": f"EP{e:02d}",
+                            "sequence_id": f"{prefix}-p{p}-e{e}-q{q}", "sequence_name": f"SQ{q:03d}0",
+                            "shot_id": f"{prefix}-p{p}-e{e}-q{q}-s{s}", "shot_name": f"SH{s:03d}0",
+                            "task_id": f"{prefix}-task{t}", "task_name": f"Task {t}",
+                        }
+                        master_id = str(uuid.uuid4())
+                        stem = f"{names['shot_id']}_t{t}"
+                        masters.append({
+                            **names, "id": master_id, "next_version_number": args.versions,
+                            "file_name": f"{stem}.blend", "file_path": f"/bench/{stem}",
+                        })
+                        for v in range(args.versions):
+                            versions.append({
+                                **names, "id": str(uuid.uuid4()), "master_shot_id": master_id,
+                                "version_number": v, "commited": v < args.versions - 1,
+                                "locked": v == args.versions - 1 and s % 10 == 0,
+                                "file_name": f"{stem}_v{v:03d}.blend", "file_path": f"/bench/{stem}/versions",
+                                "updated_at": now - timedelta(hours=len(versions) % 720),
+                            })
+    return masters, versions
+
+async def create_in_chunks(delegate, rows, chunk):
+    for i in range(0, len(rows), chunk):
+        await delegate.create_many(data=rows[i:i + chunk])
+
+async def seed(args, prefix: str) -> Tuple[List[dict], List[dict]]:
+    masters, versions = build(args, prefix)
+    start = time.perf_counter()
+    await create_in_chunks(db.mastershot, masters, args.chunk)
+    await create_in_chunks(db.versionshot, versions, args.chunk)
+    await db.execute_raw('ANALYZE "MasterShot"')
+    await db.execute_raw('ANALYZE "VersionShot"')
+    print(f"seeded {len(masters)} master shots and {len(versions)} versions in {time.perf_counter() - start:.1f}s")
+    return masters, versions
+
+async def cleanup(prefix: str):
+    await db.versionshot.delete_many(where={"project_id": {"startswith": prefix}})
+    await db.mastershot.delete_many(where={"project_id": {"startswith": prefix}})
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prefix", default="bench")
+    parser.add_argument("--cleanup", action="store_true", help="only delete the rows of this prefix")
+    add_arguments(parser, projects=2, episodes=2, sequences=3, shots=10)
+    args = parser.parse_args()
+    await connect_db()
+    try:
+        await cleanup(args.prefix)
+        if not args.cleanup:
+            await seed(args, args.prefix)
+    finally:
+        await disconnect_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark: jsonable_encoder + JSONResponse vs FastJSONResponse on list payloads.
+
+Usage:
+    python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse, orjson
+from app.schemas.shots import VersionShotResponse
+
+def build_rows(count: int):
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        shot = i // 20
+        rows.append(VersionShotResponse(
+            id=f"00000000-0000-4000-8000-{i:012d}",
+            file_name=f"ep01_sq010_sh{shot:04d}_anim_v{i % 20:03d}.blend",
+            file_path=f"/mnt/projects/feature_film/episodes/ep01/sq010/sh{shot:04d}/anim/versions",
+            version_number=i % 20,
+            commited=i % 3 == 0,
+            locked=i % 7 == 0,
+            locked_by_user_id="user-1" if i % 7 == 0 else None,
+            locked_by_user_name="Artist One" if i % 7 == 0 else None,
+            label="wip",
+            notes="Blocking pass, camera locked",
+            program="blender",
+            created_at=now - timedelta(minutes=i),
+            updated_at=now - timedelta(minutes=i),
+            edit_user_id="user-1",
+            edit_user_name="Artist One",
+            project_id="project-1",
+            project_name="Feature Film",
+            episode_id="episode-1",
+            episode_name="EP01",
+            sequence_id="sequence-1",
+            sequence_name="SQ010",
+            shot_id=f"shot-{shot}",
+            shot_name=f"SH{shot:04d}",
+            task_id="task-anim",
+            task_name="Animation",
+            master_shot_id=f"master-{shot}",
+        ))
+    return rows
+
+def envelope(rows):
+    return {"success": True, "message": "Version shots retrieved successfully!", "data": rows, "next_cursor": None}
+
+def render_old(rows) -> bytes:
+    return JSONResponse(content=jsonable_encoder(envelope(rows))).body
+
+def render_new(rows) -> bytes:
+    return FastJSONResponse(content=envelope(rows)).body
+
+def timed(fn, rows, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(rows)
+        samples.append(time.perf_counter() - start)
+    return samples, body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    old_samples, old_body = timed(render_old, rows, args.repeat)
+    new_samples, new_body = timed(render_new, rows, args.repeat)
+
+    assert json.loads(old_body) == json.loads(new_body), "encoders disagree on the payload"
+
+    old_median = statistics.median(old_samples)
+    new_median = statistics.median(new_samples)
+    print(f"rows: {args.rows}, repeat: {args.repeat}, encoder: {'orjson' if orjson else 'stdlib json'}")
+    print(f"{'path':<28}{'median ms':>12}{'min ms':>12}{'bytes':>12}")
+    print(f"{'jsonable_encoder + json':<28}{old_median * 1000:>12.1f}{min(old_samples) * 1000:>12.1f}{len(old_body):>12}")
+    print(f"{'FastJSONResponse':<28}{new_median * 1000:>12.1f}{min(new_samples) * 1000:>12.1f}{len(new_body):>12}")
+    print(f"speedup: {old_median / new_median:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+-- Baseline of the schema as originally deployed with `prisma db push`.
+-- On an existing database, mark it as applied instead of running it:
+--   npx prisma migrate resolve --applied 0_init
+
+-- CreateTable
+CREATE TABLE "MasterShot" (
+    "id" TEXT NOT NULL,
+    "file_name" TEXT NOT NULL,
+    "file_path" TEXT NOT NULL,
+    "version_folder" TEXT,
+    "created_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP(3) NOT NULL,
+    "edit_user_id" TEXT NOT NULL,
+    "edit_user_name" TEXT NOT NULL,
+    "project_id" TEXT NOT NULL,
+    "project_name" TEXT NOT NULL,
+    "episode_id" TEXT NOT NULL,
+    "episode_name" TEXT NOT NULL,
+    "sequence_id" TEXT NOT NULL,
+    "sequence_name" TEXT NOT NULL,
+    "shot_id" TEXT NOT NULL,
+    "shot_name" TEXT NOT NULL,
+    "task_id" TEXT NOT NULL,
+    "task_name" TEXT NOT NULL,
+    "nas_server_id" TEXT,
+
+    CONSTRAINT "MasterShot_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "VersionShot" (
+    "id" TEXT NOT NULL,
+    "file_name" TEXT NOT NULL,
+    "file_path" TEXT NOT NULL,
+    "version_number" INTEGER NOT NULL,
+    "commited" BOOLEAN NOT NULL DEFAULT false,
+    "locked" BOOLEAN NOT NULL DEFAULT false,
+    "locked_by_user_id" TEXT,
+    "locked_by_user_name" TEXT,
+    "label" TEXT,
+    "notes" TEXT,
+    "program" TEXT,
+    "created_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP(3) NOT NULL,
+    "edit_user_id" TEXT NOT NULL,
+    "edit_user_name" TEXT NOT NULL,
+    "project_id" TEXT NOT NULL,
+    "project_name" TEXT NOT NULL,
+    "episode_id" TEXT NOT NULL,
+    "episode_name" TEXT NOT NULL,
+    "sequence_id" TEXT NOT NULL,
+    "sequence_name" TEXT NOT NULL,
+    "shot_id" TEXT NOT NULL,
+    "shot_name" TEXT NOT NULL,
+    "task_id" TEXT NOT NULL,
+    "task_name" TEXT NOT NULL,
+    "master_shot_id" TEXT NOT NULL,
+
+    CONSTRAINT "VersionShot_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "NasServer" (
+    "id" TEXT NOT NULL,
+    "name" TEXT NOT NULL,
+    "host" TEXT NOT NULL,
+    "protocol" TEXT NOT NULL DEFAULT 'smb',
+    "port" INTEGER,
+    "username" TEXT,
+    "password" TEXT,
+    "project_path" TEXT,
+    "drive_letter" CHAR(1),
+    "created_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "NasServer_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "MasterShot_file_name_key" ON "MasterShot"("file_name");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "MasterShot_shot_id_task_id_key" ON "MasterShot"("shot_id", "task_id");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "VersionShot_file_name_key" ON "VersionShot"("file_name");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "VersionShot_file_name_file_path_key" ON "VersionShot"("file_name", "file_path");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "VersionShot_shot_id_task_id_version_number_key" ON "VersionShot"("shot_id", "task_id", "version_number");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "NasServer_name_key" ON "NasServer"("name");
+
+-- AddForeignKey
+ALTER TABLE "MasterShot" ADD CONSTRAINT "MasterShot_nas_server_id_fkey" FOREIGN KEY ("nas_server_id") REFERENCES "NasServer"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "VersionShot" ADD CONSTRAINT "VersionShot_master_shot_id_fkey" FOREIGN KEY ("master_shot_id") REFERENCES "MasterShot"("id") ON DELETE CASCADE ON UPDATE CASCADE;
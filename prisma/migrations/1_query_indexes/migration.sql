@@ -0,0 +1,53 @@
+-- Version counter used for atomic version allocation, keyset pagination indexes
+-- and the secondary indexes behind the hierarchy filters, latest-version lookups
+-- and project dashboards. IF NOT EXISTS keeps it safe on databases that already
+-- received part of this through `prisma db push`.
+
+-- AlterTable
+ALTER TABLE "MasterShot" ADD COLUMN IF NOT EXISTS "next_version_number" INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill the counter from existing versions
+UPDATE "MasterShot" m
+SET "next_version_number" = COALESCE((
+    SELECT MAX(v."version_number") + 1 FROM "VersionShot" v
+    WHERE v."shot_id" = m."shot_id" AND v."task_id" = m."task_id"
+), 0);
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "MasterShot_created_at_id_idx" ON "MasterShot"("created_at", "id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "MasterShot_project_id_episode_id_sequence_id_idx" ON "MasterShot"("project_id", "episode_id", "sequence_id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "MasterShot_project_id_updated_at_idx" ON "MasterShot"("project_id", "updated_at");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "MasterShot_task_id_idx" ON "MasterShot"("task_id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "MasterShot_nas_server_id_idx" ON "MasterShot"("nas_server_id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "VersionShot_created_at_id_idx" ON "VersionShot"("created_at", "id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "VersionShot_shot_id_created_at_id_idx" ON "VersionShot"("shot_id", "created_at", "id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "VersionShot_master_shot_id_version_number_idx" ON "VersionShot"("master_shot_id", "version_number");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "VersionShot_project_id_episode_id_sequence_id_idx" ON "VersionShot"("project_id", "episode_id", "sequence_id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "VersionShot_project_id_updated_at_idx" ON "VersionShot"("project_id", "updated_at");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "VersionShot_project_id_locked_commited_idx" ON "VersionShot"("project_id", "locked", "commited");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "VersionShot_task_id_idx" ON "VersionShot"("task_id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "NasServer_created_at_id_idx" ON "NasServer"("created_at", "id");
@@ -0,0 +1,6 @@
+-- Lease of version shot locks. A lock whose lock_expires_at has passed can be taken
+-- by anyone; clients keep their lock alive with the heartbeat endpoint. Existing locks
+-- keep a NULL lease and expire VERSION_LOCK_LEASE after the row was last updated.
+
+-- AlterTable
+ALTER TABLE "VersionShot" ADD COLUMN IF NOT EXISTS "lock_expires_at" TIMESTAMP(3);
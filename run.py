@@ -1,6 +1,80 @@
-if __name__ == "__main__":
+import argparse
+import importlib.util
+import os
+
+def available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def run_development(settings):
     import uvicorn
-    from app.config import settings
 
     uvicorn.run("app.main:app", host="0.0.0.0", port=settings.APP_PORT, reload=True)
 
+def run_production(settings, workers: int):
+    """
+    Multi-worker server without the reloader. Uses gunicorn with uvicorn workers when
+    gunicorn is installed (max-requests jitter, graceful recycling), uvicorn's own
+    process manager otherwise (no jitter; uvicorn >= 0.30 respawns recycled workers).
+    uvloop and httptools are used when installed.
+    """
+    # Every worker sizes its Prisma pool from DB_CONNECTION_BUDGET / WEB_CONCURRENCY:
+    # forked workers inherit `settings`, spawned ones read the environment.
+    settings.WEB_CONCURRENCY = workers
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    loop = "uvloop" if available("uvloop") else "asyncio"
+    http = "httptools" if available("httptools") else "h11"
+    print(f"🚀 Starting {workers} workers on port {settings.APP_PORT} (loop={loop}, http={http})")
+
+    if available("gunicorn"):
+        from gunicorn.app.base import BaseApplication
+
+        class Server(BaseApplication):
+            def load_config(self):
+                options = {
+                    "bind": f"0.0.0.0:{settings.APP_PORT}",
+                    "workers": workers,
+                    # UvicornWorker picks uvloop/httptools automatically when installed
+                    "worker_class": "uvicorn.workers.UvicornWorker",
+                    "max_requests": settings.WEB_MAX_REQUESTS,
+                    "max_requests_jitter": settings.WEB_MAX_REQUESTS_JITTER,
+                    "graceful_timeout": settings.WEB_GRACEFUL_TIMEOUT,
+                    "keepalive": settings.WEB_KEEPALIVE_TIMEOUT,
+                }
+                for key, value in options.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                from app.main import app
+                return app
+
+        Server().run()
+        return
+
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=settings.APP_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        limit_max_requests=settings.WEB_MAX_REQUESTS or None,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT,
+        timeout_keep_alive=settings.WEB_KEEPALIVE_TIMEOUT,
+        proxy_headers=True,
+    )
+
+if __name__ == "__main__":
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="Run the Kiyokai API.")
+    parser.add_argument("--production", action="store_true", help="multi-worker server (default when APP_ENV=production)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default WEB_CONCURRENCY, or one per CPU)")
+    args = parser.parse_args()
+
+    if args.production or settings.APP_ENV == "production":
+        run_production(settings, args.workers or settings.WEB_CONCURRENCY or os.cpu_count() or 1)
+    else:
+        run_development(settings)
\ No newline at end of file